@@ -13,6 +13,10 @@ ROTATED_CCW = USEREVENT + 4
 # System
 MAX_MENU_INACTIVE_TIME = 60
 DEMO_SWITCH_TIME = 120
+MENU_FPS = 120
+MAX_IDLE_WAIT = 0.5
+# Games left with the menu button are kept suspended, up to this many
+SUSPENDED_GAME_CACHE_SIZE = 3
 
 # Controllers
 CONTROLS = 0
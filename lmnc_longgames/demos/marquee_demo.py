@@ -6,6 +6,7 @@ import itertools
 import logging
 from lmnc_longgames.constants import *
 from lmnc_longgames.multiverse.multiverse_game import MultiverseGame
+from lmnc_longgames.multiverse.text_renderer import get_text_renderer
 
 
 script_path = os.path.realpath(os.path.dirname(__file__))
@@ -36,8 +37,6 @@ SEPCIAL_THANKS_ADDITIONS = [
     "24 sausage and egg baguettees"
 ]
 
-font = pygame.font.Font(f"{script_path}/../icl8x8u.bdf", 8)
-
 """
 
 """
@@ -51,8 +50,7 @@ class TextBox:
         self.y = y
         self.upscale_factor = upscale_factor
         
-        self.rendered_text = font.render(self.text, False, color)
-        self.rendered_text = pygame.transform.scale_by(self.rendered_text, self.upscale_factor)
+        self.rendered_text = get_text_renderer().render(self.text, color, self.upscale_factor)
     
     @property
     def width(self):
@@ -69,7 +67,7 @@ class TextBox:
 class MarqueeDemo(MultiverseGame):
 
     def __init__(self, multiverse_displays, header_text):
-        super().__init__("Marquee", 120, multiverse_displays)
+        super().__init__("Marquee", 60, multiverse_displays, sim_fps=120)
         self.is_setup = False
         self.speed = 50
         self.row_a = []
@@ -100,11 +98,6 @@ class MarqueeDemo(MultiverseGame):
         logging.info(f'Starting Name Marquee with {len(self.txt_lines)} names')
             
     
-    def update(self, dt):
-        self.update_row(self.row_a, 15 * self.upscale_factor, dt)
-        self.update_row(self.row_b, 27 * self.upscale_factor, dt)
-        self.update_row(self.row_c, 39 * self.upscale_factor, dt)
-         
     def update_row(self, row: list[TextBox], y, dt):
         # Move to the left
         pop_it = False
@@ -130,7 +123,7 @@ class MarqueeDemo(MultiverseGame):
                 row.append(text_box)
             
 
-    def loop(self, events: List, dt: float):
+    def update(self, events: List, dt: float):
         if not self.is_setup:
             self.setup()
             self.is_setup = True
@@ -142,11 +135,14 @@ class MarqueeDemo(MultiverseGame):
             if event.type == BUTTON_RELEASED and event.input in [BUTTON_B, ROTARY_PUSH]:
                 self.exit_game()
         
-        self.update(dt)
+        self.update_row(self.row_a, 15 * self.upscale_factor, dt)
+        self.update_row(self.row_b, 27 * self.upscale_factor, dt)
+        self.update_row(self.row_c, 39 * self.upscale_factor, dt)
         
         if(len(self.row_a) == 0 and len(self.row_b) == 0 and len(self.row_c) == 0):
             self.reset()
-        
+
+    def draw(self, alpha: float):
         self.screen.fill(BLACK)
         
         self.header.draw(self.screen)
@@ -21,7 +21,9 @@ class VideoDemo(MultiverseGame):
     TILE_INDIVISIBLE=1
     TILE_FILL=2
 
-    def __init__(self, multiverse_displays, video_file_path, fit_mode = FIT_HEIGHT, tile_mode = TILE_INDIVISIBLE):
+    FPS = 60
+
+    def __init__(self, multiverse_displays, video_file_path, fit_mode = FIT_HEIGHT, tile_mode = TILE_INDIVISIBLE, prepared = None):
         self.video_file_path = video_file_path
         print(f'Playing video {video_file_path}')
 
@@ -30,11 +32,14 @@ class VideoDemo(MultiverseGame):
             tile_mode = self.TILE_OFF
 
 
-        super().__init__("Video", 60, multiverse_displays, fixed_fps = True)
+        super().__init__("Video", self.FPS, multiverse_displays, fixed_fps = True)
         
         self.fit_mode = fit_mode
         self.tile_mode = tile_mode
-        self.setup_video()
+        if prepared is None:
+            self.setup_video()
+        else:
+            self.frame_iter, self.frame, self.fps = prepared
 
         self.v_height, self.v_width, _ = self.frame.shape
         
@@ -57,23 +62,44 @@ class VideoDemo(MultiverseGame):
             self.scaled_v_width = int(self.height * (self.v_width / self.v_height))
             self.scaled_v_height = self.height        
 
-    def setup_video(self):
-        raw_height = self.multiverse_display.height/self.multiverse_display.upscale_factor
-        raw_width = self.multiverse_display.width/self.multiverse_display.upscale_factor
+    @classmethod
+    def prepare(cls, multiverse_display, video_file_path, fit_mode = FIT_HEIGHT, tile_mode = TILE_INDIVISIBLE):
+        # Opening the container and decoding the first frame is the slow part, and doesn't need pygame
+        if '<video' in video_file_path:
+            fit_mode = cls.FIT_WIDTH
+        return cls.open_video(multiverse_display, video_file_path, fit_mode, cls.FPS)
+
+    @classmethod
+    def release_prepared(cls, prepared):
+        frame_iter, _, _ = prepared
+        frame_iter.close()
+
+    @classmethod
+    def open_video(cls, multiverse_display, video_file_path, fit_mode, fps):
+        """
+        Returns the frame iterator, the first frame and the frame rate the video plays at
+        """
+        raw_height = multiverse_display.height/multiverse_display.upscale_factor
+        raw_width = multiverse_display.width/multiverse_display.upscale_factor
 
-        if '<video' in self.video_file_path:
-            self.fps = 30
-            print(f"Resetting FPS to {self.fps} for video")
-            self.frame_iter = iio.imiter(self.video_file_path, fps="30", size=(320,240))
+        if '<video' in video_file_path:
+            fps = 30
+            print(f"Resetting FPS to {fps} for video")
+            frame_iter = iio.imiter(video_file_path, fps="30", size=(320,240))
         else:
-            scale_param = f"-1:{raw_height}" if self.fit_mode == self.FIT_HEIGHT else f"{raw_width}:-1"
-            self.frame_iter = iio.imiter(
-                self.video_file_path,
+            scale_param = f"-1:{raw_height}" if fit_mode == cls.FIT_HEIGHT else f"{raw_width}:-1"
+            frame_iter = iio.imiter(
+                video_file_path,
                 plugin="pyav",
                 format="rgb24",
-                filter_sequence=[("scale", f"{scale_param}:flags=neighbor"),("fps", f"{self.fps}")]
+                filter_sequence=[("scale", f"{scale_param}:flags=neighbor"),("fps", f"{fps}")]
             )
-        self.frame = next(self.frame_iter)
+        return frame_iter, next(frame_iter), fps
+
+    def setup_video(self):
+        self.frame_iter, self.frame, self.fps = self.open_video(
+            self.multiverse_display, self.video_file_path, self.fit_mode, self.fps
+        )
 
     def loop(self, events: List, dt: float):
 
@@ -143,3 +169,19 @@ class VideoDemo(MultiverseGame):
 
     def reset(self):
         self.setup_video()
+
+    def suspend(self, release_resources=False):
+        super().suspend(release_resources)
+        if release_resources and self.frame_iter is not None:
+            # Drops the decoder, the video starts over when resumed
+            self.frame_iter.close()
+            self.frame_iter = None
+
+    def resume(self):
+        super().resume()
+        if self.frame_iter is None:
+            self.setup_video()
+
+    def teardown(self):
+        if self.frame_iter is not None:
+            self.frame_iter.close()
@@ -2,7 +2,7 @@ from typing import List
 import pygame
 import random
 import math
-from lmnc_longgames.multiverse.multiverse_game import MultiverseGame
+from lmnc_longgames.multiverse.multiverse_game import MultiverseGame, GameObject
 from lmnc_longgames.constants import *
 from pygame.locals import *
 
@@ -28,43 +28,19 @@ TILE_HEIGHT = 4
 TILE_GAP = 1
 
 
-class Ball:
+class Ball(GameObject):
     def __init__(self, game):
-        self.game = game
+        super().__init__(game)
         self.radius: int = BALL_RADIUS * game.upscale_factor
-        self._x: int = game.width // 2
-        self._y: int = game.height - (10 * game.upscale_factor)
+        self.width = self.radius
+        self.height = self.radius
+        self.set_position(game.width // 2, game.height - (10 * game.upscale_factor))
         self.speed_x: int = 20 * random.choice([-1, 1])
         self.speed_y: int = -20
 
-        self._rect = pygame.Rect(
-            int(self._x),
-            int(self._y),
-            self.radius,
-            self.radius,
-        )
-
-    @property
-    def x(self):
-        return self._x
-
-    @x.setter
-    def x(self, value):
-        self._x = value
-        self._rect.x = int(value)
-
-    @property
-    def y(self):
-        return self._y
-
-    @y.setter
-    def y(self, value):
-        self._y = value
-        self._rect.y = int(value)
-
     def update(self, dt):
-        self.x += self.speed_x * dt * self.game.upscale_factor
-        self.y += self.speed_y * dt * self.game.upscale_factor
+        step = dt * self.game.upscale_factor
+        self.set_position(self._x + self.speed_x * step, self._y + self.speed_y * step)
 
     def draw(self):
         pygame.draw.rect(self.game.screen, WHITE, self._rect)
@@ -119,21 +95,27 @@ class Ball:
         return False
 
     def collide_window_sides(self):
-        if self.x <= 0 or self.x + self.radius >= self.game.width:
-            self.speed_x *= -1
+        # Always send the ball back inwards, it can stay past the edge for more than one step
+        if self.x <= 0 and self.speed_x < 0:
+            self.speed_x = abs(self.speed_x)
+            self.game.random_note()
+        elif self.x + self.radius >= self.game.width and self.speed_x > 0:
+            self.speed_x = -abs(self.speed_x)
             self.game.random_note()
 
     def collide_window_top(self):
-        if self.y <= 0:
-            self.speed_y *= -1
+        if self.y <= 0 and self.speed_y < 0:
+            self.speed_y = abs(self.speed_y)
             self.game.random_note()
 
     def off_screen(self):
         return self.y + self.radius >= self.game.height
 
 class Tile:
-    def __init__(self, x, y, game):
+    def __init__(self, x, y, game, row, column):
         self.game = game
+        self.row = row
+        self.column = column
         self.width = TILE_WIDTH * game.upscale_factor
         self.height = TILE_HEIGHT * game.upscale_factor
         self.x = x
@@ -142,9 +124,9 @@ class Tile:
         self.color = random.choice(PALETTE)
         self.is_visible = True
 
-    def draw(self):
+    def draw(self, surface: pygame.Surface):
         if self.is_visible:
-            pygame.draw.rect(self.game.screen, self.color, (self.x, self.y, self.width, self.height))
+            pygame.draw.rect(surface, self.color, self._rect)
 
 class Paddle:
     def __init__(self, game):
@@ -188,16 +170,82 @@ class BreakoutGame(MultiverseGame):
         t_gap = TILE_GAP * self.upscale_factor
         t_width = TILE_WIDTH * self.upscale_factor
         t_height = TILE_HEIGHT * self.upscale_factor
+        self.tile_pitch = (t_width + t_gap, t_height + t_gap)
+        self.tile_origin = (t_gap, t_gap)
         columns = len(self.multiverse_display.multiverse.displays)
+        # Tiles by [row][column], None once broken
+        self.tile_grid = [[None] * columns for _ in range(TILE_ROWS)]
         for row in range(TILE_ROWS):
             for column in range(columns):
                 x = column * ((t_width) + t_gap) + t_gap
                 y = row * (t_height + t_gap) + t_gap
-                tile = Tile(x, y, self)
+                tile = Tile(x, y, self, row, column)
                 self.tiles.append(tile)
+                self.tile_grid[row][column] = tile
+        self.tiles_remaining = len(self.tiles)
+
+        # Tiles only change when one breaks, so draw them once and patch the layer in break_tile
+        self.tile_layer = pygame.Surface((self.width, self.height))
+        self.tile_layer.fill(BLACK)
+        for tile in self.tiles:
+            tile.draw(self.tile_layer)
+
         self.ball = Ball(self)
         self.paddle = Paddle(self)
 
+    def tiles_at(self, rect: pygame.Rect) -> List[Tile]:
+        """
+        Returns the unbroken tiles overlapping rect, looked up from the grid cells it covers
+        """
+        pitch_x, pitch_y = self.tile_pitch
+        origin_x, origin_y = self.tile_origin
+        rows = len(self.tile_grid)
+        columns = len(self.tile_grid[0])
+        first_row = max((rect.top - origin_y) // pitch_y, 0)
+        last_row = min((rect.bottom - 1 - origin_y) // pitch_y, rows - 1)
+        first_column = max((rect.left - origin_x) // pitch_x, 0)
+        last_column = min((rect.right - 1 - origin_x) // pitch_x, columns - 1)
+
+        tiles = []
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                tile = self.tile_grid[row][column]
+                if tile is not None and tile._rect.colliderect(rect):
+                    tiles.append(tile)
+        return tiles
+
+    def break_tile(self, tile: Tile):
+        tile.is_visible = False
+        self.tile_grid[tile.row][tile.column] = None
+        self.tiles_remaining -= 1
+        self.tile_layer.fill(BLACK, tile._rect)
+
+    def move_ball(self, dt: float):
+        """
+        Move the ball through dt in steps no longer than the ball, checking collisions after each, so a long frame
+        can't carry it through a tile or the paddle. Tiles and the paddle are thicker than the ball, so this holds
+        for any dt, the number of steps grows with the distance moved.
+        """
+        ball = self.ball
+        distance = max(abs(ball.speed_x), abs(ball.speed_y)) * dt * self.upscale_factor
+        steps = max(1, math.ceil(distance / ball.radius))
+        step_dt = dt / steps
+        for _ in range(steps):
+            ball.update(step_dt)
+
+            # Check for collisions
+            ball.collide_paddle(self.paddle)
+            ball.collide_window_sides()
+            ball.collide_window_top()
+
+            # Check collision with tiles
+            for tile in self.tiles_at(ball._rect):
+                if ball.collide_tile(tile):
+                    self.break_tile(tile)
+
+            if ball.off_screen():
+                return
+
     def loop(self, events: List, dt: float):
         """
         Called for each iteration of the game loop
@@ -226,29 +274,17 @@ class BreakoutGame(MultiverseGame):
         elif keys[K_LEFT]:
             self.paddle.move(-1 / 5)
 
-        self.screen.fill(BLACK)
-
         if self.game_over:
-            text = self.font.render("YOU DIED", False, (135, 0, 0))
-            if all(not tile.is_visible for tile in self.tiles):
-                text = self.font.render("YOU WON", False, (135, 135, 0))
-            text = pygame.transform.scale_by(text, self.upscale_factor)
+            self.screen.fill(BLACK)
+            text = self.render_text("YOU DIED", (135, 0, 0))
+            if self.tiles_remaining == 0:
+                text = self.render_text("YOU WON", (135, 135, 0))
             text_x = (self.width // 2) - (text.get_width() // 2)
             text_y = (self.height // 2) - (text.get_height() // 2)
             self.screen.blit(text, (text_x, text_y))
         else:
-            #Update the ball and paddle
-            self.ball.update(dt)
-
-            # Check for collisions
-            self.ball.collide_paddle(self.paddle)
-            self.ball.collide_window_sides()
-            self.ball.collide_window_top()
-
-            # Check collision with tiles
-            for tile in self.tiles:
-                if tile.is_visible and self.ball.collide_tile(tile):
-                    tile.is_visible = False
+            #Update the ball, checking for collisions as it goes
+            self.move_ball(dt)
 
             # Check if the ball is off the screen
             if self.ball.off_screen():
@@ -257,15 +293,14 @@ class BreakoutGame(MultiverseGame):
                 return
 
             # Check if all tiles are cleared
-            if all(not tile.is_visible for tile in self.tiles):
+            if self.tiles_remaining == 0:
                 self.win_note()
                 self.game_over = True
                 return
 
-            # Draw the ball, paddle, and tiles
+            # Draw the tiles, ball, and paddle
+            self.screen.blit(self.tile_layer, (0, 0))
             self.ball.draw()
             self.paddle.draw()
-            for tile in self.tiles:
-                tile.draw()
 
 
@@ -4,8 +4,12 @@ import pygame
 import random
 import os
 import math
+import numpy
 from lmnc_longgames.multiverse.multiverse_game import MultiverseGame
 from lmnc_longgames.multiverse.multiverse_game import GameObject
+from lmnc_longgames.multiverse.sprite_cache import get_sprite_cache
+from lmnc_longgames.multiverse.projectile_pool import ProjectilePool
+from lmnc_longgames.multiverse.spatial_index import SpatialHash
 from lmnc_longgames.constants import *
 from pygame.locals import *
 from collections import namedtuple
@@ -18,11 +22,16 @@ TANK_WIDTH = 5
 TANK_HEIGHT = 5
 WALL_COLOR = (150,150,150)
 
-def load_sprites(name, count):
-    return [pygame.image.load(f"{script_path}/assets/{name}_{i}.png").convert_alpha() for i in range(count)]
+# Arena maze: a column of cells per display (at least two, where tanks fit), rows as close to square as fit the height
+MAZE_CELL_SIZE = 11
+# Chance of knocking out each wall left by the maze, so the arena has loops to circle around
+EXTRA_PASSAGE_CHANCE = 0.3
 
-TANK_A = load_sprites(f"tank_a", 8)
-TANK_B = load_sprites(f"tank_b", 8)
+SPRITES = get_sprite_cache(f"{script_path}/assets")
+
+# Tank sprites have a frame per direction
+TANK_A = "tank_a"
+TANK_B = "tank_b"
 
 Direction = namedtuple("Direction", "index x_dir y_dir")
 N  = Direction(0,  0, -1)
@@ -36,10 +45,107 @@ NW = Direction(7, -1, -1)
 
 Directions = [N,NE,E,SE,S,SW,W,NW]
 
+# Bounce direction (x_dir, y_dir) for a bullet that clips a wall with only one corner
+CORNER_BOUNCES = {
+    "topleft": (1, 1),
+    "topright": (-1, 1),
+    "bottomleft": (1, -1),
+    "bottomright": (-1, -1),
+}
+
 BULLET_DAMAGE = 10
+# Most bullets in play at once, between both players
+BULLET_CAPACITY = 32
 PLAYER_HEALTH = 100
 
 
+def generate_maze(columns: int, rows: int, rng: random.Random, extra_passage_chance: float = EXTRA_PASSAGE_CHANCE):
+    """
+    Carve a maze through a grid of cells with a randomized depth first search, then knock out some of the remaining
+    walls.
+
+    Returns the walls left standing, as a set of ((column, row), (column, row)) pairs of neighbouring cells.
+    """
+    walls = set()
+    for column in range(columns):
+        for row in range(rows):
+            if column + 1 < columns:
+                walls.add(((column, row), (column + 1, row)))
+            if row + 1 < rows:
+                walls.add(((column, row), (column, row + 1)))
+
+    start = (rng.randrange(columns), rng.randrange(rows))
+    visited = {start}
+    stack = [start]
+    while stack:
+        column, row = stack[-1]
+        neighbours = [
+            (c, r)
+            for c, r in ((column - 1, row), (column + 1, row), (column, row - 1), (column, row + 1))
+            if 0 <= c < columns and 0 <= r < rows and (c, r) not in visited
+        ]
+        if not neighbours:
+            stack.pop()
+            continue
+        neighbour = rng.choice(neighbours)
+        walls.discard(tuple(sorted(((column, row), neighbour))))
+        visited.add(neighbour)
+        stack.append(neighbour)
+
+    return {wall for wall in sorted(walls) if rng.random() >= extra_passage_chance}
+
+
+class WallMask:
+    """
+    The walls rasterized once into per-pixel grids, so collision checks are lookups however many walls there are.
+
+    occupied marks wall pixels. A summed area table over it counts the wall pixels in any rect with four lookups,
+    and normal_x/normal_y hold the outward facing normal of each wall pixel on a wall's surface (0 inside a wall or
+    in the open).
+    """
+
+    def __init__(self, width: int, height: int, walls: List[pygame.Rect]):
+        self.width = width
+        self.height = height
+        bounds = pygame.Rect(0, 0, width, height)
+        occupied = numpy.zeros((width, height), dtype=bool)
+        for wall in walls:
+            wall = wall.clip(bounds)
+            occupied[wall.left:wall.right, wall.top:wall.bottom] = True
+        self.occupied = occupied
+
+        self.summed = numpy.zeros((width + 1, height + 1), dtype=numpy.int32)
+        self.summed[1:, 1:] = occupied.cumsum(axis=0).cumsum(axis=1)
+
+        # A wall pixel faces the open side(s) next to it
+        free = ~numpy.pad(occupied, 1).astype(bool)
+        free = free.astype(numpy.int8)
+        self.normal_x = (free[2:, 1:-1] - free[:-2, 1:-1]) * occupied
+        self.normal_y = (free[1:-1, 2:] - free[1:-1, :-2]) * occupied
+
+    def is_wall(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.occupied[x, y])
+
+    def normal(self, x: int, y: int):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0, 0
+        return int(self.normal_x[x, y]), int(self.normal_y[x, y])
+
+    def rect_blocked(self, rect: pygame.Rect) -> bool:
+        """
+        True if any wall pixel is inside rect
+        """
+        left = min(max(rect.left, 0), self.width)
+        right = min(max(rect.right, 0), self.width)
+        top = min(max(rect.top, 0), self.height)
+        bottom = min(max(rect.bottom, 0), self.height)
+        if left >= right or top >= bottom:
+            return False
+        summed = self.summed
+        count = summed[right, bottom] - summed[left, bottom] - summed[right, top] + summed[left, top]
+        return count > 0
+
+
 class Player(GameObject):
     def __init__(self, game, player):
         super().__init__(game)
@@ -52,16 +158,16 @@ class Player(GameObject):
             self.x =  0
             self.y = 0
             self.dir = E
-            images = TANK_A
+            sprite = TANK_A
         else:
             self.x = game.width - self.width
             self.y = game.height - self.height
             self.dir = W
-            images = TANK_B
+            sprite = TANK_B
         self.speed = 10
         self.moving = False
                 
-        self.images = [pygame.transform.scale_by(image, game.upscale_factor) for image in images]
+        self.images = SPRITES.frames(sprite, len(Directions), game.upscale_factor)
             
     def rotate(self, amount):
         self.dir = Directions[(self.dir.index + amount) % len(Directions)]
@@ -72,10 +178,10 @@ class Player(GameObject):
         self.check_bullet_hits()
         if self.moving:
             
-            orig_xy = (self.x, self.y)
+            orig_xy = (self._x, self._y)
             
-            self.x += self.speed * self.game.upscale_factor * self.dir.x_dir * dt
-            self.y += self.speed * self.game.upscale_factor * self.dir.y_dir * dt
+            step = self.speed * self.game.upscale_factor * dt
+            self.set_position(self._x + step * self.dir.x_dir, self._y + step * self.dir.y_dir)
             
             if self.x + self.width >= self.game.width - 1:
                 self.x = self.game.width - 1 - self.width
@@ -88,30 +194,28 @@ class Player(GameObject):
                 self.y = 0
              
             if self.collision_with_wall() or self.collision_with_other_player():
-                self.x, self.y = orig_xy
+                self.set_position(*orig_xy)
             
 
     def check_bullet_hits(self):
         
         other_player = P2 if self.player == P1 else P1
         
-        hits = set([bullet for bullet in self.game.bullets if bullet.player == other_player and self.collides_with(bullet)])
+        hits = [bullet for bullet in self.game.bullet_index.query(self._rect) if bullet.player == other_player]
         
         if len(hits) > 0:
             logging.info(f"Player {self.player} hit!")
             self.game.death_note()
             
-            #Remove bullet from list
-            self.game.bullets.difference_update(hits)
+            #Remove bullet from play
+            for bullet in hits:
+                bullet.despawn()
             
             #Drop player health
             self.health -= len(hits) * BULLET_DAMAGE
 
     def collision_with_wall(self):
-        for wall in self.game.walls:
-            if self.collides_with(wall):
-                return True
-        return False
+        return self.game.wall_mask.rect_blocked(self._rect)
     
     def collision_with_other_player(self):
         other_player = self.game.p2_tank if self.player == P1 else self.game.p1_tank
@@ -123,18 +227,21 @@ class Player(GameObject):
         screen.blit(image, (self.x, self.y))
         
     def fire(self):
-        bullet = Bullet(self.game, self._rect.centerx, self._rect.centery, self.dir, self.player)
-        self.game.bullets.add(bullet)
-        self.game.random_note()
+        if self.game.bullets.spawn(self._rect.centerx, self._rect.centery, self.dir, self.player) is not None:
+            self.game.random_note()
     
 class Bullet(GameObject):
-    def __init__(self, game, x, y, dir: Direction, player):
+    __slots__ = ("speed", "dir", "x_dir", "y_dir", "player", "bounce_count", "active")
+
+    def __init__(self, game):
         super().__init__(game)
         self.width = 1 * game.upscale_factor
         self.height = 1 * game.upscale_factor
         self.speed = 20
-        self.x = x
-        self.y = y
+
+    def spawn(self, x, y, dir: Direction, player):
+        self.set_position(x, y)
+        self.game.bullet_index.insert(self, self._rect)
         self.dir = dir
         self.x_dir = dir.x_dir
         self.y_dir = dir.y_dir
@@ -145,71 +252,65 @@ class Bullet(GameObject):
     def update(self, dt: float):
         super().update(dt)
         
-        for wall in self.game.walls:
-            if self.collide_wall(wall):
-                self.bounce_count += 1
+        if self.collide_walls():
+            self.bounce_count += 1
         
-        self.x += dt * self.speed * self.game.upscale_factor * self.x_dir
-        self.y += dt * self.speed * self.game.upscale_factor * self.y_dir
+        step = dt * self.speed * self.game.upscale_factor
+        x = self._x + step * self.x_dir
+        y = self._y + step * self.y_dir
+        self.set_position(x, y)
+        self.game.bullet_index.update(self)
         
-        if self.bounce_count > 3 or self.y > self.game.height or self.y < 0 or self.x > self.game.width or self.x < 0:
-            self.game.bullets.remove(self)
+        if self.bounce_count > 3 or y > self.game.height or y < 0 or x > self.game.width or x < 0:
+            self.despawn()
+
+    def despawn(self):
+        self.game.bullet_index.remove(self)
+        self.game.bullets.despawn(self)
             
 
         
-    def collide_wall(self, wall: pygame.rect.Rect):
-        # wall = wall.copy()
-        # wall.heigh += 1
-        # wall.width += 1
+    def collide_walls(self):
+        mask = self.game.wall_mask
         collision_rect = self._rect.copy()
         collision_rect.height += 1
         collision_rect.width += 1
-        if collision_rect.colliderect(wall):
-            if wall.collidepoint(collision_rect.topleft) and wall.collidepoint(collision_rect.topright):
-                #full top hit
-                #send down
-                self.y_dir = 1
-            elif wall.collidepoint(collision_rect.bottomleft) and wall.collidepoint(collision_rect.bottomright):
-                #full bottom hit
-                #send up
-                self.y_dir = -1
-            elif wall.collidepoint(collision_rect.topright) and wall.collidepoint(collision_rect.bottomright):
-                #full right hit
-                #send left
-                self.x_dir = -1
-            elif wall.collidepoint(collision_rect.topleft) and wall.collidepoint(collision_rect.bottomleft):
-                #full left hit
-                #send right
-                self.x_dir = 1    
-            
-            # Check for corner hits
-            elif wall.collidepoint(collision_rect.topright):
-                #corner hit, down and left
-                self.y_dir = 1
-                self.x_dir = -1
-                # self.y = wall.bottom
-                # self.x = wall.left - self.width
-            elif wall.collidepoint(collision_rect.topleft):
-                #corner hit, down and right
-                self.y_dir = 1
-                self.x_dir = 1
-                # self.y = wall.bottom
-                # self.x = wall.right
-            elif wall.collidepoint(collision_rect.bottomleft):
-                #corner hit, up and right
-                self.y_dir = -1
-                self.x_dir = 1
-                # self.y = wall.top - self.height
-                # self.x = wall.right
-            elif wall.collidepoint(collision_rect.bottomright):
-                #corner hit, up and left
-                self.y_dir = -1
-                self.x_dir = -1
-                # self.y = wall.top - self.height
-                # self.x = wall.left - self.width
-            self.game.random_note(waveform=32)
-            return True
-        return False
+        if not mask.rect_blocked(collision_rect):
+            return False
+
+        corners = {
+            name: mask.is_wall(*getattr(collision_rect, name))
+            for name in ("topleft", "topright", "bottomleft", "bottomright")
+        }
+        if corners["topleft"] and corners["topright"]:
+            #full top hit
+            #send down
+            self.y_dir = 1
+        elif corners["bottomleft"] and corners["bottomright"]:
+            #full bottom hit
+            #send up
+            self.y_dir = -1
+        elif corners["topright"] and corners["bottomright"]:
+            #full right hit
+            #send left
+            self.x_dir = -1
+        elif corners["topleft"] and corners["bottomleft"]:
+            #full left hit
+            #send right
+            self.x_dir = 1
+        else:
+            # Corner hit, bounce off the surface at that corner, or straight back out if it's a wall's corner
+            for name, (x_dir, y_dir) in CORNER_BOUNCES.items():
+                if corners[name]:
+                    normal_x, normal_y = mask.normal(*getattr(collision_rect, name))
+                    if normal_x or normal_y:
+                        x_dir = normal_x or self.x_dir
+                        y_dir = normal_y or self.y_dir
+                    self.x_dir = x_dir
+                    self.y_dir = y_dir
+                    break
+        self.game.random_note(waveform=32)
+        return True
     
     def draw(self, screen):
         pygame.draw.rect(screen, WHITE, self._rect)
@@ -221,29 +322,83 @@ class CombatGame(MultiverseGame):
     '''
     def __init__(self, multiverse_display):
         super().__init__("Combat", 60, multiverse_display)
-        self.bullets = set()
+        self.bullets = ProjectilePool(lambda: Bullet(self), BULLET_CAPACITY)
+        # Bullets in play, bucketed by arena cell, for the tanks' hit checks
+        self.bullet_index = SpatialHash(MAZE_CELL_SIZE * self.upscale_factor)
         self.walls = []
+        self.wall_mask = None
+        self.wall_layer = None
+        # A fixed arena can be set with "arena_seed" under games/combat in the config, otherwise every game is new
+        self.arena_seed = self.config.config.get("games", {}).get("combat", {}).get("arena_seed")
         self.reset()
         
 
     def reset(self):
         self.game_over = False
-        self.bullets = set()
+        self.bullets.clear()
+        self.bullet_index.clear()
         self.p1_tank = Player(self, P1)
         self.p2_tank = Player(self, P2)
-        self.walls = []
-        
-        # Build the walls
+        self.walls = self.build_arena()
+        self.wall_mask = WallMask(self.width, self.height, self.walls)
+
+        # The walls never change during a game, draw them once
+        self.wall_layer = pygame.Surface((self.width, self.height))
+        self.wall_layer.fill(BLACK)
+        for wall in self.walls:
+            pygame.draw.rect(self.wall_layer, WALL_COLOR, wall)
+
+    def build_arena(self) -> List[pygame.Rect]:
+        """
+        Lay out the walls of a maze arena, with a column of cells per display
+        """
+        seed = self.arena_seed if self.arena_seed is not None else random.randrange(1 << 32)
+        logging.info(f"Combat arena seed: {seed}")
+        rng = random.Random(seed)
+
+        rows = max(1, round(self.height / (MAZE_CELL_SIZE * self.upscale_factor)))
         wall_width = 2 * self.upscale_factor
-        
-        # 4 vertical walls
-        
-        v_wall_gap = self.width // 5
-        for i in range(1,5):
-            wall = pygame.Rect(i * v_wall_gap, self.height // 4, wall_width, self.height // 2)
-            self.walls.append(wall)
-        
-        # 2 horizontal walls
+
+        # A maze needs at least two columns, in one column every wall is carved out to join the cells up. But there
+        # can only be as many columns as leave room for a tank to drive between the walls.
+        fit = self.width // ((TANK_WIDTH + 1) * self.upscale_factor + wall_width)
+        columns = min(max(2, self.display_count), fit)
+        if columns < 2:
+            return self.build_ladder_arena(rows, wall_width, rng)
+
+        def boundary_x(column):
+            return round(column * self.width / columns)
+
+        def boundary_y(row):
+            return round(row * self.height / rows)
+
+        walls = []
+        for (column, row), (next_column, next_row) in generate_maze(columns, rows, rng):
+            if next_column != column:
+                # Wall between side by side cells, overlapping the corners so the joins are solid
+                x = boundary_x(next_column) - wall_width // 2
+                top = boundary_y(row) - wall_width // 2
+                bottom = boundary_y(row + 1) + wall_width // 2
+                walls.append(pygame.Rect(x, top, wall_width, bottom - top))
+            else:
+                y = boundary_y(next_row) - wall_width // 2
+                left = boundary_x(column) - wall_width // 2
+                right = boundary_x(column + 1) + wall_width // 2
+                walls.append(pygame.Rect(left, y, right - left, wall_width))
+        return walls
+
+    def build_ladder_arena(self, rows: int, wall_width: int, rng: random.Random) -> List[pygame.Rect]:
+        """
+        Lay out the walls of an arena too narrow for a maze: a wall across each boundary between rows, leaving a gap
+        a tank fits through at one end or the other
+        """
+        gap = (TANK_WIDTH + 2) * self.upscale_factor
+        walls = []
+        for row in range(1, rows):
+            y = round(row * self.height / rows) - wall_width // 2
+            left = gap if rng.random() < 0.5 else 0
+            walls.append(pygame.Rect(left, y, self.width - gap, wall_width))
+        return walls
         
         
 
@@ -294,14 +449,12 @@ class CombatGame(MultiverseGame):
                 return
                 
 
-        self.screen.fill(BLACK)
-
         if self.game_over:
+            self.screen.fill(BLACK)
             if self.winner == 1:
-                text = self.font.render("PLAYER 1 WINS!", False, (135, 135, 0))
+                text = self.render_text("PLAYER 1 WINS!", (135, 135, 0))
             else:
-                text = self.font.render("PLAYER 2 WINS!", False, (135, 135, 0))
-            text = pygame.transform.scale_by(text, self.upscale_factor)
+                text = self.render_text("PLAYER 2 WINS!", (135, 135, 0))
             text_x = (self.width // 2) - (text.get_width() // 2)
             text_y = (self.height // 2) - (text.get_height() // 2)
             self.screen.blit(text, (text_x, text_y))
@@ -310,8 +463,9 @@ class CombatGame(MultiverseGame):
             self.p1_tank.update(dt)
             self.p2_tank.update(dt)
             
-            for bullet in list(self.bullets):
+            for bullet in self.bullets:
                 bullet.update(dt)
+            self.bullets.sweep()
             
             if self.p1_tank.health <= 0:
                 self.game_over = True
@@ -322,8 +476,7 @@ class CombatGame(MultiverseGame):
                 self.winner = P1
                 
                 
-            for wall in self.walls:
-                pygame.draw.rect(self.screen, WALL_COLOR, wall)
+            self.screen.blit(self.wall_layer, (0, 0))
                 
             # Draw the things
             for bullet in self.bullets:
@@ -3,8 +3,11 @@ import pygame
 import random
 import os
 import math
+import numpy
 from lmnc_longgames.multiverse.multiverse_game import MultiverseGame
 from lmnc_longgames.multiverse.multiverse_game import GameObject
+from lmnc_longgames.multiverse.sprite_cache import get_sprite_cache
+from lmnc_longgames.multiverse.projectile_pool import ProjectilePool, AnimationClock
 from lmnc_longgames.constants import *
 from pygame.locals import *
 
@@ -26,62 +29,129 @@ INVADER_HEIGHT = 5
 PLAYER_WIDTH = 5
 PLAYER_HEIGHT = 4
 
-def load_sprites(name, count):
-    return [pygame.image.load(f"{script_path}/assets/{name}_{i}.png").convert_alpha() for i in range(count)]
+# Most bullets of each kind in play at once
+PLAYER_BULLET_CAPACITY = 32
+INVADER_BULLET_CAPACITY = 16
+# Seconds per invader bullet animation frame
+INVADER_BULLET_FRAME_TIME = 0.1
 
-IMG_INVADER_A = load_sprites(f"invader_a", 2)
-IMG_INVADER_B = load_sprites(f"invader_b", 2)
-IMG_INVADER_C = load_sprites(f"invader_c", 2)
+SPRITES = get_sprite_cache(f"{script_path}/assets")
 
-IMG_INVADERS = [IMG_INVADER_A, IMG_INVADER_B, IMG_INVADER_C]
+# Sprite name and animation frame count
+SPRITE_INVADERS = ["invader_a", "invader_b", "invader_c"]
+INVADER_FRAMES = 2
+SPRITE_INVADER_BULLET = "invader_bullet"
+INVADER_BULLET_FRAMES = 4
+SPRITE_INVADER_PLAYER = "invader_player"
 
-IMG_INVADER_BULLET = load_sprites("invader_bullet", 4)
+class InvaderFormation:
+    """
+    The invaders, stored as arrays rather than an object each.
 
-IMG_INVADER_PLAYER = pygame.image.load(f"{script_path}/assets/invader_player.png").convert_alpha()
+    The formation moves as one block, so it's a grid of slots: an x position per column, a y position per row, and an
+    alive flag per slot. Moving, bouncing off the edges, shifting down and checking for reaching the player work on
+    the columns and rows that still have invaders in them, and bullets look up the slots they overlap directly.
+    """
 
-class Invader(GameObject):
-    def __init__(self, game, x, y, color, images):
-        super().__init__(game)
-        self.width = INVADER_WIDTH * game.upscale_factor
-        self.height = INVADER_HEIGHT * game.upscale_factor
-        self.x = x
-        self.y = y        
-        self.color = color
-        self.images = []
-        for image in images:
-            image = pygame.transform.scale_by(image, game.upscale_factor)
-            pxar = pygame.PixelArray(image)
-            pxar.replace(WHITE, self.color)
-            del pxar
-            self.images.append(image)
-        #TODO replace color
-        
-    def update(self, dt, move_dir):
-        super().update(dt)
-        self.x += self.game.invader_speed * dt * move_dir
-        if self.x <= 0:
-            self.x = 0
-            self.game.invader_shift = True
-        if self.x >= self.game.width - self.width - 1:
-            self.game.invader_shift = True
-            self.x = self.game.width - self.width - 1
-        #TODO if it hits the player, Game Over
-            
-    
-    def move_down(self):
-        self.y += self.height + INVADER_GAP * self.game.upscale_factor
-        self.game.play_note(0, 105, release=1000, waveform=32)
+    def __init__(self, game, rows: int, columns: int):
+        self.game = game
+        upscale_factor = game.upscale_factor
+        self.invader_width = INVADER_WIDTH * upscale_factor
+        self.invader_height = INVADER_HEIGHT * upscale_factor
+        gap = INVADER_GAP * upscale_factor
+        self.pitch_x = self.invader_width + gap
+        self.pitch_y = self.invader_height + gap
+
+        self.column_x = numpy.arange(columns, dtype=float) * self.pitch_x + gap
+        self.row_y = numpy.arange(rows, dtype=float) * self.pitch_y + gap
+        self.alive = numpy.ones((rows, columns), dtype=bool)
+        self.count = rows * columns
+
+        self.row_images = [
+            SPRITES.frames(SPRITE_INVADERS[row % 3], INVADER_FRAMES, upscale_factor, tint=PALETTE[row % len(PALETTE)])
+            for row in range(rows)
+        ]
+
+    def __len__(self):
+        return self.count
+
+    def move(self, dx: float) -> bool:
+        """
+        Move the formation across, stopping at the screen edges. Returns True if it reached an edge.
+        """
+        self.column_x += dx
+        alive_columns = numpy.flatnonzero(self.alive.any(axis=0))
+        if len(alive_columns) == 0:
+            return False
+
+        left = self.column_x[alive_columns[0]]
+        right = self.column_x[alive_columns[-1]]
+        max_x = self.game.width - self.invader_width - 1
+        if left <= 0:
+            self.column_x -= left
+            return True
+        if right >= max_x:
+            self.column_x -= right - max_x
+            return True
+        return False
+
+    def shift_down(self):
+        self.row_y += self.pitch_y
+
+    def bottom(self) -> int:
+        alive_rows = numpy.flatnonzero(self.alive.any(axis=1))
+        if len(alive_rows) == 0:
+            return 0
+        return int(self.row_y[alive_rows[-1]]) + self.invader_height
+
+    def slot_rect(self, row: int, column: int) -> pygame.Rect:
+        return pygame.Rect(int(self.column_x[column]), int(self.row_y[row]), self.invader_width, self.invader_height)
+
+    def _slot_range(self, start: int, end: int, positions, pitch: int):
+        # Slots whose span could overlap [start, end), one either side to cover rounding
+        first = int((start - positions[0]) // pitch) - 1
+        last = int((end - positions[0]) // pitch) + 1
+        return range(max(first, 0), min(last, len(positions) - 1) + 1)
+
+    def hit(self, rect: pygame.Rect):
+        """
+        Returns the (row, column) slots of the live invaders rect overlaps
+        """
+        hits = []
+        for row in self._slot_range(rect.top, rect.bottom, self.row_y, self.pitch_y):
+            for column in self._slot_range(rect.left, rect.right, self.column_x, self.pitch_x):
+                if self.alive[row, column] and self.slot_rect(row, column).colliderect(rect):
+                    hits.append((row, column))
+        return hits
+
+    def kill(self, row: int, column: int):
+        if self.alive[row, column]:
+            self.alive[row, column] = False
+            self.count -= 1
+
+    def random_invader(self):
+        """
+        Returns the (row, column) slot of a random live invader
+        """
+        row, column = numpy.unravel_index(random.choice(numpy.flatnonzero(self.alive)), self.alive.shape)
+        return int(row), int(column)
 
-    def draw(self, screen):
-        #pygame.draw.rect(screen, self.color, self._rect)
-        
-        image = self.images[self.game.animation_index]
-        
-        screen.blit(image, (self.x, self.y))
-    
     def fire(self):
-        self.game.invader_bullets.append(InvaderBullet(self.game, self.x, self.y))
-        self.game.random_note()
+        row, column = self.random_invader()
+        if self.game.invader_bullets.spawn(self.column_x[column], self.row_y[row]) is not None:
+            self.game.random_note()
+
+    def draw(self, screen, animation_index: int):
+        rows, columns = numpy.nonzero(self.alive)
+        xs = self.column_x.astype(int)[columns]
+        ys = self.row_y.astype(int)[rows]
+        screen.blits(
+            [
+                (self.row_images[row][animation_index], (x, y))
+                for row, x, y in zip(rows.tolist(), xs.tolist(), ys.tolist())
+            ],
+            doreturn=False,
+        )
             
 class Player(GameObject):
     def __init__(self, game):
@@ -93,7 +163,7 @@ class Player(GameObject):
         self.speed = 5
         
         self.color = random.choice(PALETTE)
-        self.image = pygame.transform.scale_by(IMG_INVADER_PLAYER, game.upscale_factor)
+        self.image = SPRITES.get(SPRITE_INVADER_PLAYER, upscale_factor=game.upscale_factor)
     
     def move(self, move_amount):
         self.x += self.speed * move_amount * self.game.upscale_factor
@@ -112,52 +182,51 @@ class Player(GameObject):
         #pygame.draw.rect(screen, WHITE, self._rect)
         
     def fire(self):
-        bullet = PlayerBullet(self.game, self.x + (PLAYER_WIDTH // 2) * self.game.upscale_factor, self.y)
-        self.game.player_bullets.append(bullet)
-        self.game.random_note()
+        x = self.x + (PLAYER_WIDTH // 2) * self.game.upscale_factor
+        if self.game.player_bullets.spawn(x, self.y) is not None:
+            self.game.random_note()
     
 class InvaderBullet(GameObject):
-    def __init__(self, game, x, y):
+    __slots__ = ("speed", "images", "active")
+
+    def __init__(self, game):
         super().__init__(game)
         self.width = 3 * game.upscale_factor
         self.height = 5 * game.upscale_factor
         self.speed = 20
-        self.x = x
-        self.y = y
-        self.frame_time = 100
-        self.frame = 0
-        self.next_frame = pygame.time.get_ticks() + self.frame_time
-        self.images = [pygame.transform.scale_by(image, game.upscale_factor) for image in IMG_INVADER_BULLET]
-        
+        self.images = SPRITES.frames(SPRITE_INVADER_BULLET, INVADER_BULLET_FRAMES, game.upscale_factor)
+
+    def spawn(self, x, y):
+        self.set_position(x, y)
         
     def update(self, dt: float):
         super().update(dt)
         
-        self.y += dt * self.speed * self.game.upscale_factor
+        self.set_position(self._x, self._y + dt * self.speed * self.game.upscale_factor)
+        if self._y > self.game.height:
+            self.game.invader_bullets.despawn(self)
         
     def draw(self, screen):
-        now = pygame.time.get_ticks()
-        if(self.next_frame < now):
-            self.frame = (self.frame + 1) % len(IMG_INVADER_BULLET)
-            self.next_frame = now + self.frame_time
-        
-        screen.blit(self.images[self.frame], (self.x, self.y))
+        screen.blit(self.images[self.game.invader_bullet_clock.frame], (self.x, self.y))
 
 class PlayerBullet(GameObject):
-    def __init__(self, game, x, y):
+    __slots__ = ("speed", "active")
+
+    def __init__(self, game):
         super().__init__(game)
         self.width = 1 * game.upscale_factor
         self.height = 1 * game.upscale_factor
         self.speed = 20
-        self.x = x
-        self.y = y
-        
+
+    def spawn(self, x, y):
+        self.set_position(x, y)
         
     def update(self, dt: float):
         super().update(dt)
-        self.y -= dt * self.speed * self.game.upscale_factor
-        if self.y > self.game.height:
-            self.game.invader_bullets.remove(self)
+        self.set_position(self._x, self._y - dt * self.speed * self.game.upscale_factor)
+        # Gone once the tail (3 bullet heights) is off the top
+        if self._y + self.height * 3 < 0:
+            self.game.player_bullets.despawn(self)
         
     
     def draw(self, screen):
@@ -174,10 +243,10 @@ class InvadersGame(MultiverseGame):
     '''
     def __init__(self, multiverse_display):
         super().__init__("Invaders", 120, multiverse_display)
-        self.invaders = []
-        self.player_bullets = []
-        self.invader_bullets = []
-        self.invader_shift = False
+        self.invaders = None
+        self.player_bullets = ProjectilePool(lambda: PlayerBullet(self), PLAYER_BULLET_CAPACITY)
+        self.invader_bullets = ProjectilePool(lambda: InvaderBullet(self), INVADER_BULLET_CAPACITY)
+        self.invader_bullet_clock = AnimationClock(INVADER_BULLET_FRAME_TIME, INVADER_BULLET_FRAMES)
         self.invader_move_dir = 1
         self.invader_speed = 0
         self.animation_index = 0
@@ -186,25 +255,15 @@ class InvadersGame(MultiverseGame):
 
     def reset(self):
         self.game_over = False
-        self.invaders = []
-        self.player_bullets = []
-        self.invader_bullets = []
-        self.invader_shift = False
+        self.player_bullets.clear()
+        self.invader_bullets.clear()
+        self.invader_bullet_clock.reset()
         self.invader_move_dir = 1
         self.invader_speed = 12
         self.animation_index = 0
         self.next_animation_tick = 0
-        gap = INVADER_GAP * self.upscale_factor
-        width = INVADER_WIDTH * self.upscale_factor
-        height = INVADER_HEIGHT * self.upscale_factor
         columns = len(self.multiverse_display.multiverse.displays)
-        for row in range(INVADER_ROWS):
-            row_color = PALETTE[row]
-            for column in range(columns):
-                x = column * (width + gap) + gap
-                y = row * (height + gap) + gap
-                invader = Invader(self, x, y, row_color, IMG_INVADERS[row % 3])
-                self.invaders.append(invader)
+        self.invaders = InvaderFormation(self, INVADER_ROWS, columns)
         self.player = Player(self)
 
     def loop(self, events: List, dt: float):
@@ -249,28 +308,25 @@ class InvadersGame(MultiverseGame):
 
         if self.game_over:
             if len(self.invaders) == 0:
-                text = self.font.render("YOU WON", False, (135, 135, 0))
+                text = self.render_text("YOU WON", (135, 135, 0))
             else:
-                text = self.font.render("YOU DIED", False, (135, 0, 0))
-            text = pygame.transform.scale_by(text, self.upscale_factor)
+                text = self.render_text("YOU DIED", (135, 0, 0))
             text_x = (self.width // 2) - (text.get_width() // 2)
             text_y = (self.height // 2) - (text.get_height() // 2)
             self.screen.blit(text, (text_x, text_y))
         else:
-            for invader in self.invaders:
-                invader.update(dt, self.invader_move_dir)
-                if invader._rect.bottom > self.player.y:
-                    self.game_over = True
-                    self.death_note()
-                    return
+            invader_shift = self.invaders.move(self.invader_speed * dt * self.invader_move_dir)
+            if self.invaders.bottom() > self.player.y:
+                self.game_over = True
+                self.death_note()
+                return
             if len(self.invaders) > 0 and invader_fire:
-                random.choice(self.invaders).fire()
+                self.invaders.fire()
 
-            if self.invader_shift:
-                self.invader_shift = False
+            if invader_shift:
                 self.invader_move_dir = -self.invader_move_dir
-                for invader in self.invaders:
-                    invader.move_down()
+                self.invaders.shift_down()
+                self.play_note(0, 105, release=1000, waveform=32)
                 self.invader_speed += 3
             
             for bullet in self.player_bullets:
@@ -278,19 +334,24 @@ class InvadersGame(MultiverseGame):
             
             for bullet in self.invader_bullets:
                 bullet.update(dt)
+            self.invader_bullet_clock.update(dt)
                 
-            hit_bullets = []
-            hit_invaders = []
-            # Bullet collisions with invaders
+            hit_bullets = set()
+            hit_invaders = set()
+            # Bullet collisions with invaders, each bullet only checks the formation slots it overlaps
             for bullet in self.player_bullets:
-                for invader in self.invaders:
-                    if bullet.collides_with(invader):
-                        #Invader Hit!
-                        hit_bullets.append(bullet)
-                        hit_invaders.append(invader)
-            
-            self.player_bullets = [b for b in self.player_bullets if b not in hit_bullets]
-            self.invaders = [i for i in self.invaders if i not in hit_invaders]
+                hits = self.invaders.hit(bullet._rect)
+                if hits:
+                    #Invader Hit!
+                    hit_bullets.add(bullet)
+                    hit_invaders.update(hits)
+
+            for bullet in hit_bullets:
+                self.player_bullets.despawn(bullet)
+            self.player_bullets.sweep()
+            self.invader_bullets.sweep()
+            for row, column in hit_invaders:
+                self.invaders.kill(row, column)
             
             for bullet in self.invader_bullets:
                 if bullet.collides_with(self.player):
@@ -316,7 +377,6 @@ class InvadersGame(MultiverseGame):
                 bullet.draw(self.screen)
                 
             self.player.draw(self.screen)
-            for invader in self.invaders:
-                invader.draw(self.screen)
+            self.invaders.draw(self.screen, self.animation_index)
 
 
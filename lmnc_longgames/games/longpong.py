@@ -1,8 +1,8 @@
 from typing import List
 import pygame
-import random
 import math
-from lmnc_longgames.multiverse.multiverse_game import MultiverseGame
+import numpy
+from lmnc_longgames.multiverse.multiverse_game import MultiverseGame, GameObject, EntityStore
 from lmnc_longgames.constants import *
 
 MODE_AI_VS_AI = 0
@@ -14,6 +14,10 @@ PLAYER_PADDLE_MOVE_STEPS = 3
 PLAYER_PADDLE_SPEED = PLAYER_PADDLE_MOVE_STEPS * 30
 AI_PADDLE_SPEED = 2 * 30
 
+# How far off the AI aims, as a standard deviation in paddle heights for a ball crossing the whole screen. The error
+# grows with the distance the ball still has to travel, so long shots are misjudged more than short ones.
+AI_AIM_ERROR = 0.5
+
 CODE_1 = [
     (ROTATED_CCW, ROTARY_PUSH),
     (ROTATED_CW, ROTARY_PUSH),
@@ -29,27 +33,19 @@ longpong
 """
 
 
-class Player:
+class Player(GameObject):
     def __init__(self, rect: pygame.Rect, game) -> None:
+        super().__init__(game)
         # Paddle
         self._rect = rect
+        self._x = rect.x
+        self._y = rect.y
         self.direction: int = 0  # Direction the player's paddle is moving
         self.speed: int = 0
 
         # Game
         self.is_ai: bool = True
         self.score: int = 0
-        self._y = rect.y
-        self.game = game
-
-    @property
-    def y(self):
-        return self._y
-
-    @y.setter
-    def y(self, value):
-        self._y = value
-        self._rect.y = int(value)
 
     # Side of the board the player is on
     @property
@@ -64,14 +60,6 @@ class Player:
         self.score = 0
         self.direction = 0
 
-    @property
-    def width(self):
-        return self._rect.w
-
-    @property
-    def height(self):
-        return self._rect.h
-
     def update_paddle(self, dt: float):
         speed = PLAYER_PADDLE_SPEED * self.game.upscale_factor
         if self.is_ai:
@@ -90,62 +78,64 @@ class Player:
         self.y = max(min(self.y, self.game.height - self.height), 0)
 
 
-class Ball:
+class Balls(EntityStore):
+    """
+    All the balls in play. Their state is kept in numpy arrays so moving, bouncing and scoring work on every ball at
+    once, however many there are.
+    """
+
     max_speed = 80
     min_speed = 15
 
-    def __init__(self, radius: int, game: MultiverseGame) -> None:
+    def __init__(self, count: int, radius: int, game: MultiverseGame) -> None:
+        super().__init__(game, count, radius, radius)
         self.radius = radius
-        self.direction_y = -1
-        self.direction_x = 1
-        self.game = game
-        self._rect = pygame.Rect(
-            self.game.width // 2 - self.radius // 2,
-            self.game.height // 2 - self.radius // 2,
-            self.radius,
-            self.radius,
-        )
-        self.reset()
-
-    @property
-    def x(self):
-        return self._x
-
-    @x.setter
-    def x(self, value):
-        self._x = value
-        self._rect.x = int(value)
-
-    @property
-    def y(self):
-        return self._y
-
-    @y.setter
-    def y(self, value):
-        self._y = value
-        self._rect.y = int(value)
-
-    def reset(self):
-        self._rect.center = (self.game.width // 2, self.game.height // 2)
-        self._x = self._rect.x
-        self._y = self._rect.y
-        self.angle = random.uniform(0.2, math.pi / 4)
-        self.direction_y = random.choice((-1, 1))
-        self.speed = ((self.max_speed - self.min_speed) / 2) + self.min_speed
+        # Positions before the last simulation step, for interpolated drawing
+        self.prev_x = numpy.zeros(count)
+        self.prev_y = numpy.zeros(count)
+        self.angle = numpy.zeros(count)
+        self.speed = numpy.zeros(count)
+        # Serve every other ball to the left
+        self.direction_x = numpy.where(numpy.arange(count) % 2 == 0, 1.0, -1.0)
+        self.direction_y = numpy.ones(count)
+        # Where each ball will cross the line of the paddle it's heading for, as the AI sees it. Predicted whenever a
+        # ball's path changes (serve, bounce or paddle hit), along with the simulation time the ball comes within reach
+        # of the AI and the time it gets to the paddle.
+        self.intercept_y = numpy.zeros(count)
+        self.react_at = numpy.zeros(count)
+        self.arrive_at = numpy.zeros(count)
+        # The AI's aim error for each ball's current shot, in paddle heights. Drawn when a ball is served or hit so
+        # the AI commits to one guess per shot, wall bounces included.
+        self.aim_error = numpy.zeros(count)
+
+    def reset(self, which: numpy.ndarray = None):
+        """
+        Serve balls from the centre, all of them or only those selected by the boolean mask which
+        """
+        if which is None:
+            which = numpy.ones(self.count, dtype=bool)
+        serving = numpy.count_nonzero(which)
+        self.set_position(which, self.game.width // 2 - self.radius // 2, self.game.height // 2 - self.radius // 2)
+        self.prev_x[which] = self.x[which]
+        self.prev_y[which] = self.y[which]
+        self.angle[which] = numpy.random.uniform(0.2, math.pi / 4, serving)
+        self.direction_y[which] = numpy.random.choice((-1.0, 1.0), serving)
+        self.speed[which] = ((self.max_speed - self.min_speed) / 2) + self.min_speed
+        self.game.predict_intercepts(which, new_shot=True)
 
     @property
-    def speed_x(self):
-        return self.speed * math.cos(self.angle) * self.direction_x
+    def speed_x(self) -> numpy.ndarray:
+        return self.speed * numpy.cos(self.angle) * self.direction_x
 
     @property
-    def speed_y(self):
-        return self.speed * math.sin(self.angle) * self.direction_y
+    def speed_y(self) -> numpy.ndarray:
+        return self.speed * numpy.sin(self.angle) * self.direction_y
 
 
 class LongPongGame(MultiverseGame):
-    def __init__(self, multiverse_display, game_mode=0):
-        super().__init__("Long Pong", 120, multiverse_display)
-        print(f"Game Mode: {game_mode}")
+    def __init__(self, multiverse_display, game_mode=0, ball_count=1):
+        super().__init__("Long Pong", 60, multiverse_display, sim_fps=120)
+        print(f"Game Mode: {game_mode}, Balls: {ball_count}")
 
         paddle_width = 2 * self.upscale_factor
         paddle_height = 10 * self.upscale_factor
@@ -173,113 +163,199 @@ class LongPongGame(MultiverseGame):
         self.player_two.is_ai = game_mode != MODE_TWO_PLAYER
         print(f"Player Two is AI? {self.player_two.is_ai}")
 
-        # Create ball
+        # Simulation time, for when balls reach the paddles
+        self.sim_time = 0.0
+
+        # Create balls
         ball_radius = 2 * self.upscale_factor
-        self.ball = Ball(ball_radius, self)
+        self.balls = Balls(ball_count, ball_radius, self)
+        self.balls.reset()
 
     # Function to update the score on the screen
     def draw_score(self):
-        text = self.font.render(
-            f"{self.player_one.score}    {self.player_two.score}", False,  WHITE
-        )
-        text = pygame.transform.scale_by(text, self.upscale_factor)
+        text = self.render_text(f"{self.player_one.score}    {self.player_two.score}")
         text_rect = text.get_rect(center=(self.width // 2, 10 * self.upscale_factor))
         self.screen.blit(text, text_rect)
 
     def update_for_ai(self, ai_player: Player):
-        if (
-            self.ball.direction_x != ai_player.position
-            or abs(self.ball._rect.centerx - ai_player._rect.centerx) > self.width // 2
-        ):
+        balls = self.balls
+        # Balls heading for this paddle that are close enough for the AI to react to. Everything here was worked out
+        # when the balls' paths last changed, so this is only comparisons.
+        approaching = (balls.direction_x == ai_player.position) & (balls.react_at <= self.sim_time)
+        if not approaching.any():
             ai_player.direction = 0
             return
 
+        # Go for whichever ball will get here first
+        target_y = balls.intercept_y[numpy.where(approaching, balls.arrive_at, numpy.inf).argmin()]
+
         # AI Player logic
-        if ai_player._rect.centery < self.ball._rect.centery - ai_player.height // 2:
+        if ai_player._rect.centery < target_y - ai_player.height // 4:
             ai_player.direction = 1
-        elif ai_player._rect.centery > self.ball._rect.centery + ai_player.height // 2:
+        elif ai_player._rect.centery > target_y + ai_player.height // 4:
             ai_player.direction = -1
         else:
             ai_player.direction = 0
 
-    def score_and_reset(self, player: Player):
-        player.score += 1
-        print(f"Score: {self.player_one.score}/{self.player_two.score}")
-        self.ball.reset()
-        self.play_note(0, 55, release=1000, waveform=32)
-
-    # Function to update the ball's position
-    def update_ball(self, dt: float):
-        self.ball.x += self.ball.speed_x * dt * self.upscale_factor
-        self.ball.y += self.ball.speed_y * dt * self.upscale_factor
+    def paddle_line(self, player: Player) -> float:
+        """
+        The ball x at which a ball touches the player's paddle
+        """
+        if player.position < 0:
+            return player.width
+        return self.width - player.width - self.balls.radius
 
-        # Detect Left Paddle Collision
-        left_collision = self.ball._rect.left <= self.player_one.width and (
-            abs(self.ball._rect.centery - self.player_one._rect.centery)
-            <= self.player_one.height // 2
-        )
+    def predict_intercepts(self, which: numpy.ndarray, new_shot: bool = False):
+        """
+        Work out where the selected balls' centres will be when they reach the paddle they're heading for, with the
+        AI's aim error added. Called whenever a ball's path changes, the AI only looks the result up. new_shot draws
+        a new aim error, for balls that were just served or hit.
 
-        # Detect Right Paddle Collision
-        right_collision = (
-            self.ball._rect.right >= self.width - self.player_two.width
-            and (
-                abs(self.ball._rect.centery - self.player_two._rect.centery)
-                <= self.player_two.height // 2
-            )
-        )
+        Bounces off the top and bottom are folded out: each ball's y is followed in a straight line as if the walls
+        weren't there, then reflected back into the court.
+        """
+        balls = self.balls
+        heading_left = balls.direction_x[which] < 0
+        paddle_x = numpy.where(heading_left, self.paddle_line(self.player_one), self.paddle_line(self.player_two))
+        paddle_height = numpy.where(heading_left, self.player_one.height, self.player_two.height)
+        distance_x = numpy.abs(paddle_x - balls.x[which])
+        speed_x = numpy.abs(balls.speed_x[which])
+
+        # The AI reacts once a ball is within half the screen of its paddle
+        pixels_per_second = speed_x * self.upscale_factor
+        balls.arrive_at[which] = self.sim_time + distance_x / pixels_per_second
+        balls.react_at[which] = self.sim_time + numpy.maximum(distance_x - self.width // 2, 0) / pixels_per_second
+
+        y, _ = self.fold_into_court(balls.y[which] + balls.speed_y[which] * (distance_x / speed_x))
+
+        # The AI misjudges long shots more than short ones
+        if new_shot:
+            balls.aim_error[which] = numpy.random.standard_normal(len(y)) * AI_AIM_ERROR * (distance_x / self.width)
+        error = balls.aim_error[which] * paddle_height
+        balls.intercept_y[which] = y + balls.radius / 2 + error
+
+    def fold_into_court(self, y: numpy.ndarray):
+        """
+        Reflect ball y positions that went past the top or bottom back into the court, as many times as it takes.
+        Balls bounce when their top reaches 0 or their bottom reaches height - 1.
 
-        # Check collision with paddles
-        if left_collision:
-            self.update_ball_from_collision(self.player_one)
+        Returns the folded positions and a mask of the balls that end up travelling the other way.
+        """
+        court = self.height - 1 - self.balls.radius
+        y = y % (2 * court)
+        flipped = y > court
+        return numpy.where(flipped, 2 * court - y, y), flipped
 
-        elif right_collision:
-            self.update_ball_from_collision(self.player_two)
+    def score_and_reset(self, player: Player, which: numpy.ndarray):
+        player.score += numpy.count_nonzero(which)
+        print(f"Score: {self.player_one.score}/{self.player_two.score}")
+        self.balls.reset(which)
+        self.play_note(0, 55, release=1000, waveform=32)
 
-        # Check collision with top
-        if self.ball._rect.top <= 0:
-            self.ball.direction_y = 1
+    # Function to update the balls' positions
+    def update_balls(self, dt: float):
+        """
+        Move every ball through dt in one go. Each ball's path is a ray that's folded off the top and bottom, and
+        tested against the paddles where it crosses their faces, so the result doesn't depend on the size of dt.
+        """
+        balls = self.balls
+        balls.prev_x[:] = balls.x
+        balls.prev_y[:] = balls.y
+        start_direction_y = balls.direction_y.copy()
+        balls.x += balls.speed_x * dt * self.upscale_factor
+        end_y = balls.y + balls.speed_y * dt * self.upscale_factor
+
+        # Check collision with top and bottom
+        balls.y[:], wall_collision = self.fold_into_court(end_y)
+        if wall_collision.any():
+            balls.direction_y[wall_collision] *= -1
+            self.predict_intercepts(wall_collision)
             self.random_note()
 
-        # Check collision with bottom
-        if self.ball._rect.bottom >= (self.height - 1):
-            self.ball.direction_y = -1
-            self.random_note()
+        # Check collision with paddles
+        left_collision = self.collide_paddle(self.player_one, start_direction_y, end_y)
+        right_collision = self.collide_paddle(self.player_two, start_direction_y, end_y)
+        if left_collision.any():
+            self.update_balls_from_collision(self.player_one, left_collision)
+        if right_collision.any():
+            self.update_balls_from_collision(self.player_two, right_collision)
+
+        # Check if any balls went out of bounds
+        out_left = balls.right <= 0
+        out_right = balls.left >= self.width
+        if out_left.any():
+            self.score_and_reset(self.player_two, out_left)
+        if out_right.any():
+            self.score_and_reset(self.player_one, out_right)
+
+    def collide_paddle(self, player: Player, start_direction_y: numpy.ndarray, end_y: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns a mask of the balls hitting the player's paddle this step.
+
+        Balls that crossed the paddle's face during the step are tested where they crossed it, not where they ended
+        up, and are moved back to that point. end_y is where the balls would be if there were no walls.
+        """
+        balls = self.balls
+        face = self.paddle_line(player)
+        if player.position < 0:
+            towards = balls.direction_x < 0
+            reached = balls.left <= face
+            crossed = towards & (balls.prev_x > face) & (balls.x <= face)
+        else:
+            towards = balls.direction_x > 0
+            reached = balls.left >= face
+            crossed = towards & (balls.prev_x < face) & (balls.x >= face)
+
+        test_y = balls.y.copy()
+        test_direction_y = balls.direction_y.copy()
+        if crossed.any():
+            start_x = balls.prev_x[crossed]
+            start_y = balls.prev_y[crossed]
+            fraction = (start_x - face) / (start_x - balls.x[crossed])
+            test_y[crossed], flipped = self.fold_into_court(start_y + (end_y[crossed] - start_y) * fraction)
+            test_direction_y[crossed] = numpy.where(flipped, -1, 1) * start_direction_y[crossed]
+
+        centery = test_y.astype(int) + balls.radius // 2
+        hit = towards & reached & (numpy.abs(centery - player._rect.centery) <= player.height // 2)
+
+        contact = hit & crossed
+        balls.x[contact] = face
+        balls.y[contact] = test_y[contact]
+        balls.direction_y[contact] = test_direction_y[contact]
+        return hit
+
+    def update_balls_from_collision(self, colliding_paddle: Player, which: numpy.ndarray):
+        balls = self.balls
+        delta_y = numpy.abs(balls.centery[which] - colliding_paddle._rect.centery)
+        angle = math.pi / 4 * (delta_y / (colliding_paddle.height / 2))
+
+        # keep balls from getting stuck in a stalemate
+        balls.angle[which] = numpy.where(angle < 0.01, 0.02, angle)
+
+        # Increase ball speed if paddle is moving in the same direction, decrease it if paddle is moving in the
+        # opposite direction
+        paddle_movement = colliding_paddle.direction * balls.direction_y[which]
+        speed = balls.speed[which]
+        speed = numpy.where(paddle_movement > 0, numpy.minimum(speed * 1.2, balls.max_speed), speed)
+        speed = numpy.where(paddle_movement < 0, numpy.maximum(speed / 1.2, balls.min_speed), speed)
+        balls.speed[which] = speed
 
-        # Check if the ball went out of bounds
-        if self.ball._rect.right <= 0:
-            self.score_and_reset(self.player_two)
-        elif self.ball._rect.left >= self.width:
-            self.score_and_reset(self.player_one)
-
-    def update_ball_from_collision(self, colliding_paddle: Player):
-        delta_y = abs(self.ball._rect.centery - colliding_paddle._rect.centery)
-        self.ball.angle = math.pi / 4 * (delta_y / (colliding_paddle.height / 2))
-
-        # keep ball from getting stuck in a stalemate
-        if self.ball.angle < 0.01:
-            self.ball.angle = 0.02
-
-        # Increase ball speed if paddle is moving in the same direction
-        if colliding_paddle.direction * self.ball.speed_y > 0:
-            self.ball.speed = min(self.ball.speed * 1.2, self.ball.max_speed)
-        # Decrease ball speed if paddle is moving in the opposite direction
-        elif colliding_paddle.direction * self.ball.speed_y < 0:
-            self.ball.speed = max(self.ball.speed / 1.2, self.ball.min_speed)
         # Reverse the direction of travel
-        self.ball.direction_x = colliding_paddle.position * -1
+        balls.direction_x[which] = colliding_paddle.position * -1
+        self.predict_intercepts(which, new_shot=True)
 
         # Beep!
         self.random_note()
 
-    def loop(self, events: List, dt: float):
+    def update(self, events: List, dt: float):
         """
-        Called for each iteration of the game loop
+        Called for each fixed simulation step
 
         Parameters:
-            events: The pygame events list for this loop iteration
-            dt: The delta time since the last loop iteration. This is for framerate independence.
+            events: The pygame events that arrived since the last step
+            dt: The fixed simulation timestep
         """
-        super().loop(events, dt)
+        self.sim_time += dt
 
         if self.has_history(P1, CODE_1):
             self.reset_input_history(P1)
@@ -324,15 +400,22 @@ class LongPongGame(MultiverseGame):
         # Update game elements
         self.player_one.update_paddle(dt)
         self.player_two.update_paddle(dt)
-        self.update_ball(dt)
+        self.update_balls(dt)
 
+    def draw(self, alpha: float):
+        """
+        Called once per output frame
+
+        Parameters:
+            alpha: How far between the last two simulation steps to draw the ball
+        """
         # Fill the screen
         self.screen.fill(BLACK)
 
-        # Draw paddles and ball
+        # Draw paddles and balls
         pygame.draw.rect(self.screen, WHITE, self.player_one._rect)
         pygame.draw.rect(self.screen, WHITE, self.player_two._rect)
-        pygame.draw.rect(self.screen, WHITE, self.ball._rect)
+        self.draw_balls(alpha)
 
         pygame.draw.line(
             self.screen,
@@ -345,9 +428,29 @@ class LongPongGame(MultiverseGame):
         # Draw score
         self.draw_score()
 
+    def draw_balls(self, alpha: float):
+        """
+        Write every ball's pixels straight into the screen in one go
+        """
+        balls = self.balls
+        size = balls.radius
+        ball_x = (balls.prev_x + (balls.x - balls.prev_x) * alpha).astype(int)
+        ball_y = (balls.prev_y + (balls.y - balls.prev_y) * alpha).astype(int)
+
+        # Every pixel of every ball, clipped to the screen
+        offsets = numpy.arange(size)
+        xs = (ball_x[:, None, None] + offsets[None, :, None]).repeat(size, axis=2).ravel()
+        ys = (ball_y[:, None, None] + offsets[None, None, :]).repeat(size, axis=1).ravel()
+        on_screen = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+
+        pixels = pygame.surfarray.pixels2d(self.screen)
+        pixels[xs[on_screen], ys[on_screen]] = self.screen.map_rgb(WHITE)
+        # Release the surface lock before anything else draws
+        del pixels
+
     def reset(self):
         super().reset()
-        self.ball.reset()
+        self.balls.reset()
         self.player_one.reset()
         self.player_two.reset()
 
@@ -1,4 +1,6 @@
 from typing import List
+from collections import deque
+import heapq
 import pygame
 import random
 import math
@@ -12,24 +14,235 @@ RIGHT=1
 DOWN=2
 LEFT=3
 
+# Grid step for each direction
+DIRECTION_STEPS = {UP: (-1, 0), RIGHT: (0, 1), DOWN: (1, 0), LEFT: (0, -1)}
+
+MODE_AI = 0
+MODE_ONE_PLAYER = 1
+
+# Seconds the AI waits on the "YOU DIED" screen before starting again
+AI_RESTART_TIME = 3.0
+
+# Grid cell states
+EMPTY=0
+BODY=1
+FOOD=2
+
+# Colour of each cell state, indexed by the grid to draw it
+PALETTE = numpy.array([BLACK, (50, 100, 0), (135, 0, 0)], dtype=numpy.uint8)
+TAIL_COLOR = (100, 100, 0)
+HEAD_COLOR = (0, 200, 0)
+STALK_COLOR = (0, 135, 0)
+
+class FreeCells:
+    """
+    The empty cells of the grid, with constant time add, remove and random choice.
+
+    Cells are kept in a list, with each cell's position in the list looked up by cell id. Removing swaps the last cell
+    into the gap, so the list never has holes to skip over.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.height = height
+        self.cells = [(x, y) for x in range(width) for y in range(height)]
+        self.positions = list(range(width * height))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.positions[cell[0] * self.height + cell[1]] >= 0
+
+    def add(self, cell):
+        cell_id = cell[0] * self.height + cell[1]
+        if self.positions[cell_id] < 0:
+            self.positions[cell_id] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        cell_id = cell[0] * self.height + cell[1]
+        position = self.positions[cell_id]
+        if position < 0:
+            return
+        last = self.cells.pop()
+        if position < len(self.cells):
+            self.cells[position] = last
+            self.positions[last[0] * self.height + last[1]] = position
+        self.positions[cell_id] = -1
+
+    def choice(self):
+        return self.cells[random.randrange(len(self.cells))]
+
+
+UNREACHABLE = 1 << 30
+
+
+class DistanceField:
+    """
+    Path distances over the grid from every cell to a target cell (the food), avoiding blocked cells (the snake).
+
+    Setting a new target does a full breadth first search. After that the field is patched as the snake moves: when a
+    cell is blocked, only the cells whose shortest paths all ran through it are invalidated and re-derived from their
+    neighbours, and when a cell is freed, shorter paths through it are relaxed outwards. A move usually touches a
+    handful of cells rather than the whole grid.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.height = height
+        size = width * height
+        self.blocked = bytearray(size)
+        self.distances = [UNREACHABLE] * size
+        self.target = None
+        self.neighbours = []
+        for x in range(width):
+            for y in range(height):
+                cells = [(x + dx, y + dy) for dx, dy in DIRECTION_STEPS.values()]
+                self.neighbours.append(
+                    [cx * height + cy for cx, cy in cells if 0 <= cx < width and 0 <= cy < height]
+                )
+
+    def cell_id(self, cell) -> int:
+        return cell[0] * self.height + cell[1]
+
+    def distance(self, cell) -> int:
+        return self.distances[self.cell_id(cell)]
+
+    def set_target(self, cell):
+        self.target = self.cell_id(cell)
+        self.recompute()
+
+    def clear_target(self):
+        self.target = None
+        self.distances = [UNREACHABLE] * len(self.distances)
+
+    def recompute(self):
+        distances = [UNREACHABLE] * len(self.distances)
+        self.distances = distances
+        if self.target is None or self.blocked[self.target]:
+            return
+        distances[self.target] = 0
+        queue = deque([self.target])
+        while queue:
+            u = queue.popleft()
+            next_distance = distances[u] + 1
+            for v in self.neighbours[u]:
+                if not self.blocked[v] and distances[v] == UNREACHABLE:
+                    distances[v] = next_distance
+                    queue.append(v)
+
+    def block(self, cell):
+        i = self.cell_id(cell)
+        if self.blocked[i]:
+            return
+        self.blocked[i] = 1
+        if i == self.target:
+            self.clear_target()
+            return
+
+        distances = self.distances
+        old_distance = distances[i]
+        distances[i] = UNREACHABLE
+        if old_distance == UNREACHABLE:
+            return
+
+        # Walk out from the blocked cell level by level, invalidating cells left without a neighbour one step closer
+        # to the target. Every cell on a level is settled before the next level is checked against it.
+        affected = []
+        queue = deque([(i, old_distance)])
+        while queue:
+            u, u_distance = queue.popleft()
+            for v in self.neighbours[u]:
+                if self.blocked[v] or distances[v] != u_distance + 1:
+                    continue
+                if any(distances[w] == u_distance for w in self.neighbours[v]):
+                    continue
+                distances[v] = UNREACHABLE
+                affected.append(v)
+                queue.append((v, u_distance + 1))
+
+        # Re-derive the invalidated cells from the unaffected cells around them
+        heap = []
+        for v in affected:
+            best = min(distances[w] for w in self.neighbours[v]) + 1
+            if best < UNREACHABLE:
+                distances[v] = best
+                heap.append((best, v))
+        heapq.heapify(heap)
+        while heap:
+            u_distance, u = heapq.heappop(heap)
+            if u_distance != distances[u]:
+                continue
+            for v in self.neighbours[u]:
+                if not self.blocked[v] and distances[v] > u_distance + 1:
+                    distances[v] = u_distance + 1
+                    heapq.heappush(heap, (u_distance + 1, v))
+
+    def unblock(self, cell):
+        i = self.cell_id(cell)
+        if not self.blocked[i]:
+            return
+        self.blocked[i] = 0
+        if self.target is None:
+            return
+
+        distances = self.distances
+        best = min(distances[w] for w in self.neighbours[i]) + 1
+        if best >= UNREACHABLE:
+            return
+        distances[i] = best
+        queue = deque([i])
+        while queue:
+            u = queue.popleft()
+            next_distance = distances[u] + 1
+            for v in self.neighbours[u]:
+                if not self.blocked[v] and distances[v] > next_distance:
+                    distances[v] = next_distance
+                    queue.append(v)
+
+    def open_area(self, cell, limit: int) -> int:
+        """
+        Counts the unblocked cells reachable from cell, stopping once limit is reached
+        """
+        start = self.cell_id(cell)
+        seen = {start}
+        queue = deque([start])
+        while queue and len(seen) < limit:
+            u = queue.popleft()
+            for v in self.neighbours[u]:
+                if not self.blocked[v] and v not in seen:
+                    seen.add(v)
+                    queue.append(v)
+        return min(len(seen), limit)
+
+
 """
 It's snake
 """
 class SnakeGame(MultiverseGame):
-    def __init__(self, multiverse_display: Multiverse, game_mode=0):
-        super().__init__("Snake", 120, multiverse_display)
+    def __init__(self, multiverse_display: Multiverse, game_mode=MODE_ONE_PLAYER):
+        super().__init__("Snake", 60, multiverse_display, sim_fps=120)
+        self.is_ai = game_mode == MODE_AI
         
         self.pixel_size = 2 * self.upscale_factor
         self.grid_width = int(self.width / self.pixel_size)
         self.grid_height = int(self.height / self.pixel_size)
         self.moving_active = True
+        # The grid is drawn a pixel per cell, then scaled up to the screen in one go
+        self.grid_surface = pygame.Surface((self.grid_width, self.grid_height))
+        self.scaled_grid_surface = pygame.Surface((self.grid_width * self.pixel_size, self.grid_height * self.pixel_size))
         self.reset()
 
     def reset(self):
         self.game_over = False
-        self.grid = numpy.zeros((self.grid_width, self.grid_height))
+        self.grid = numpy.zeros((self.grid_width, self.grid_height), dtype=numpy.uint8)
+        self.free_cells = FreeCells(self.grid_width, self.grid_height)
+        # The AI steers by distances to the food, kept up to date as cells fill and empty
+        self.distance_field = DistanceField(self.grid_width, self.grid_height) if self.is_ai else None
+        self.ai_cell = None
+        self.game_over_timer = AI_RESTART_TIME
         self.snake_head = (self.grid_width//2, self.grid_height//2)
-        self.snake = [(int(self.snake_head[0]), int(self.snake_head[1]))]
+        self.snake = deque([(int(self.snake_head[0]), int(self.snake_head[1]))])
+        self.fill_cell(self.snake[0], BODY)
         self.snake_target_length = 10
         self.snake_dir = random.choice([UP,DOWN,LEFT,RIGHT])
         self.snake_speed = 5.0
@@ -37,6 +250,27 @@ class SnakeGame(MultiverseGame):
         self.food_position = None
         self.speedup_timer = 5.0
         self.moving_active = True
+
+    def fill_cell(self, cell, state):
+        """
+        Set a grid cell's state, keeping the free cell index (and the AI's distance field) up to date
+        """
+        previous = self.grid[cell[0], cell[1]]
+        self.grid[cell[0], cell[1]] = state
+        if state == EMPTY:
+            self.free_cells.add(cell)
+        else:
+            self.free_cells.remove(cell)
+
+        if self.distance_field is not None:
+            if state == BODY:
+                self.distance_field.block(cell)
+            elif previous == BODY:
+                self.distance_field.unblock(cell)
+            if state == FOOD:
+                self.distance_field.set_target(cell)
+            elif previous == FOOD and state == EMPTY:
+                self.distance_field.clear_target()
     
     def update_snake(self, dt):
         
@@ -58,7 +292,7 @@ class SnakeGame(MultiverseGame):
             new_y = new_y + (dt * self.snake_speed)
 
         # Bounds check
-        if new_x < 0 or new_x > self.grid_width or new_y < 0 or new_y > self.grid_height:
+        if new_x < 0 or new_x >= self.grid_width or new_y < 0 or new_y >= self.grid_height:
             print(f"We died on a wall 0,0,{self.grid_width},{self.grid_height}. {new_x},{new_y} ")
             self.game_over = True
             self.death_note()
@@ -70,25 +304,25 @@ class SnakeGame(MultiverseGame):
             #we moved
             self.moving_active = True
             self.snake.append(int_pos)
-            new_cell = self.grid[int_pos[0]][int_pos[1]]
-            if new_cell == 1:
+            new_cell = self.grid[int_pos[0], int_pos[1]]
+            if new_cell == BODY:
                 # We hit ourselves :(
                 print("We hit ourselves")
                 self.game_over = True
                 return
-            if new_cell == 2:
+            if new_cell == FOOD:
                 # We got food!
                 self.food_position = None
                 self.snake_target_length = self.snake_target_length + 5
                 self.food_timer = 2.0 # New food in 2 seconds
                 print("Ate an apple. Yum :)")
             
-            self.grid[int_pos[0]][int_pos[1]] = 1
+            self.fill_cell(int_pos, BODY)
             
             growing = len(self.snake) < self.snake_target_length
             if not growing:
-                cleared_tail = self.snake.pop(0)
-                self.grid[cleared_tail[0]][cleared_tail[1]] = 0
+                cleared_tail = self.snake.popleft()
+                self.fill_cell(cleared_tail, EMPTY)
                 
         self.snake_head = (new_x, new_y)
         
@@ -100,11 +334,13 @@ class SnakeGame(MultiverseGame):
             
             # Remove old food
             if self.food_position is not None:
-                self.grid[self.food_position[0]][self.food_position[1]] = 0
+                self.fill_cell(self.food_position, EMPTY)
+                self.food_position = None
                 
-            # New food
-            self.food_position = random.choice(numpy.argwhere(self.grid==0))
-            self.grid[self.food_position[0]][self.food_position[1]] = 2
+            # New food, if there's anywhere left to put it
+            if len(self.free_cells):
+                self.food_position = self.free_cells.choice()
+                self.fill_cell(self.food_position, FOOD)
     
     def turn_snake(self, dir):
         if self.moving_active:
@@ -112,19 +348,53 @@ class SnakeGame(MultiverseGame):
             self.random_note()
             self.moving_active = False
 
-    def loop(self, events: List, dt: float):
+    def steer_ai(self):
+        """
+        Pick the direction out of the cell the head just entered. Heads for the food along the distance field, but
+        won't go into an area too small to hold the snake if there's a roomier way.
+        """
+        head = self.snake[-1]
+        if head == self.ai_cell:
+            return
+        self.ai_cell = head
+
+        field = self.distance_field
+        best_dir = None
+        best_score = None
+        for turn in (0, 1, -1):
+            direction = (self.snake_dir + turn) % 4
+            dx, dy = DIRECTION_STEPS[direction]
+            cell = (head[0] + dx, head[1] + dy)
+            if not (0 <= cell[0] < self.grid_width and 0 <= cell[1] < self.grid_height):
+                continue
+            if self.grid[cell[0], cell[1]] == BODY:
+                continue
+
+            room = field.open_area(cell, len(self.snake) + 1)
+            # Roomy enough first, then closest to the food, then roomiest (which also covers there being no food)
+            score = (room > len(self.snake), -field.distance(cell), room)
+            if best_score is None or score > best_score:
+                best_score = score
+                best_dir = direction
+
+        if best_dir is not None:
+            self.snake_dir = best_dir
+        self.moving_active = False
+
+    def update(self, events: List, dt: float):
         """
-        Called for each iteration of the game loop
+        Called for each fixed simulation step
 
         Parameters:
-            events: The pygame events list for this loop iteration
-            dt: The delta time since the last loop iteration. This is for framerate independence.
+            events: The pygame events that arrived since the last step
+            dt: The fixed simulation timestep
         """
         for event in events:
-            if (event.type == ROTATED_CCW and event.controller == P1) or (event.type == pygame.KEYDOWN and event.key == pygame.K_UP):
-                self.turn_snake(-1)
-            if event.type == ROTATED_CW and event.controller == P1 or (event.type == pygame.KEYDOWN and event.key == pygame.K_DOWN):
-                self.turn_snake(1)
+            if not self.is_ai:
+                if (event.type == ROTATED_CCW and event.controller == P1) or (event.type == pygame.KEYDOWN and event.key == pygame.K_UP):
+                    self.turn_snake(-1)
+                if event.type == ROTATED_CW and event.controller == P1 or (event.type == pygame.KEYDOWN and event.key == pygame.K_DOWN):
+                    self.turn_snake(1)
             if self.game_over and event.type == BUTTON_RELEASED and event.controller == P1 and event.input in [BUTTON_A]:
                 self.reset()
                 return
@@ -132,37 +402,52 @@ class SnakeGame(MultiverseGame):
                 self.exit_game()
                 return
 
+        if self.is_ai:
+            if self.game_over:
+                self.game_over_timer -= dt
+                if self.game_over_timer <= 0:
+                    self.reset()
+            else:
+                self.steer_ai()
+
+        if not self.game_over:
+            # Update game elements
+            self.update_snake(dt)
+            self.update_food(dt)
+
+    def draw(self, alpha: float):
         # Fill the screen
         self.screen.fill(BLACK)
         
         if self.game_over:
-            text = self.font.render("YOU DIED", False, (135, 0, 0))
-            text = pygame.transform.scale_by(text, self.upscale_factor)
+            text = self.render_text("YOU DIED", (135, 0, 0))
             text_x = (self.width // 2) - (text.get_width() // 2)
             text_y = (self.height // 2) - (text.get_height() // 2)
             self.screen.blit(text, (text_x, text_y))
-        else:     
-            # Update game elements
-            self.update_snake(dt)
-            self.update_food(dt)
+        else:
             self.draw_grid()
 
     def draw_grid(self):
-        for idx, x in numpy.ndenumerate(self.grid):
-            grid_x, grid_y = idx
-            if x == 1:
-                color = (50, 100, 0)
-                if idx == self.snake[0]:
-                    #tail
-                    color = (100, 100, 0)
-                if idx == self.snake[-1]:
-                    #head
-                    color = (0, 200, 0)
-                    
-                pygame.draw.rect(self.screen, color, pygame.Rect(grid_x * self.pixel_size, grid_y * self.pixel_size, self.pixel_size, self.pixel_size))
-            if x == 2:
-                pygame.draw.rect(self.screen, (135,0,0), pygame.Rect(grid_x * self.pixel_size, grid_y * self.pixel_size, self.pixel_size, self.pixel_size))
-                pygame.draw.rect(self.screen, (0,135,0), pygame.Rect(grid_x * self.pixel_size + self.pixel_size - self.upscale_factor, grid_y * self.pixel_size, self.upscale_factor, self.upscale_factor))
+        # Map the cell states to colours, then colour the tail and head
+        pixels = PALETTE[self.grid]
+        for (x, y), color in ((self.snake[0], TAIL_COLOR), (self.snake[-1], HEAD_COLOR)):
+            if self.grid[x, y] == BODY:
+                pixels[x, y] = color
+
+        pygame.surfarray.blit_array(self.grid_surface, pixels)
+        pygame.transform.scale(self.grid_surface, self.scaled_grid_surface.get_size(), self.scaled_grid_surface)
+        self.screen.blit(self.scaled_grid_surface, (0, 0))
+
+        if self.food_position is not None:
+            # The apple's stalk, in the top right corner of its cell
+            food_x, food_y = self.food_position
+            stalk = pygame.Rect(
+                food_x * self.pixel_size + self.pixel_size - self.upscale_factor,
+                food_y * self.pixel_size,
+                self.upscale_factor,
+                self.upscale_factor,
+            )
+            pygame.draw.rect(self.screen, STALK_COLOR, stalk)
 
     def fire_controller_input_event(self, event_id: int):
         event = pygame.event.Event(event_id)
@@ -4,6 +4,7 @@ import serial
 import threading
 import signal
 import struct
+import time
 import logging
 
 __version__ = '0.0.3'
@@ -27,6 +28,13 @@ class Display:
     PHASE_RELEASE = 3
     PHASE_OFF = 4
 
+    # Smoothing for the measured frame write interval
+    FRAME_INTERVAL_SMOOTHING = 0.1
+
+    # How often the display thread wakes up, normally and while paused
+    RUN_INTERVAL = 0.005
+    PAUSED_RUN_INTERVAL = 0.05
+
     def __init__(self, port, w, h, x, y, rotate=0, dummy=False):
         self.path = port
         self.port = None
@@ -47,6 +55,14 @@ class Display:
         self._port_write_lock = threading.Lock()
         self._message_queue = []
         self._buffer = None
+        # Set when _buffer hasn't been written to the display yet
+        self._buffer_dirty = False
+        # While paused the buffer is only written when it changes, instead of continuously
+        self._paused = False
+
+        # Measured interval between completed frame writes, in seconds
+        self._frame_interval = None
+        self._last_frame_write = None
 
     def setup(self):
         if self.dummy:
@@ -59,6 +75,8 @@ class Display:
             logging.debug(f"{self.x},{self.y}: Clearing display")
             self.clear()
             self.is_setup = True
+            # The display was just cleared, so whatever we were showing needs to go out again
+            self._buffer_dirty = True
         except Exception as e:
             logging.debug(f"{self.x},{self.y}: Exception while setting up display", exc_info = e)
             self.port = None
@@ -74,7 +92,7 @@ class Display:
 
     def run(self):
         logging.debug(f"{self.x},{self.y}: Running....")
-        while not self._stop_flag.wait(timeout=0.005):
+        while not self._stop_flag.wait(timeout=self.PAUSED_RUN_INTERVAL if self._paused else self.RUN_INTERVAL):
             if self.dummy:
                 # Nothing to do here, move along
                 continue
@@ -100,14 +118,57 @@ class Display:
         logging.debug(f"{self.x},{self.y}: Run is done")
 
     def _update_display(self):
-        if self._buffer is not None:
-            self.write(header=b"multiverse:data", data=self._buffer)
+        if self._paused and not self._buffer_dirty:
+            return
+        # Clear the flag before grabbing the buffer, so an update landing mid-write is sent next time around
+        self._buffer_dirty = False
+        buffer = self._buffer
+        if buffer is not None:
+            if self.write(header=b"multiverse:data", data=buffer):
+                # One-off writes while paused are spaced by how often the frame changes, not by the link
+                if not self._paused:
+                    self._record_frame_write(time.perf_counter())
+            else:
+                self._last_frame_write = None
+                self._buffer_dirty = True
+
+    def pause(self):
+        """
+        Stop continuously re-sending the current frame. New frames are still written once each.
+        """
+        self._paused = True
+        # Idle time would otherwise be counted as a slow frame
+        self._last_frame_write = None
+
+    def resume(self):
+        self._paused = False
+        # The first write after resuming starts a new interval rather than timing the whole pause
+        self._last_frame_write = None
+
+    def _record_frame_write(self, now):
+        if self._last_frame_write is not None:
+            interval = now - self._last_frame_write
+            if self._frame_interval is None:
+                self._frame_interval = interval
+            else:
+                self._frame_interval += (interval - self._frame_interval) * self.FRAME_INTERVAL_SMOOTHING
+        self._last_frame_write = now
+
+    @property
+    def frame_rate(self):
+        """
+        Sustained frames per second this display's link has been accepting, or None if not measured yet
+        """
+        interval = self._frame_interval
+        if interval is None or interval <= 0:
+            return None
+        return 1.0 / interval
 
     def write(self, header, data=None):
         if self.port is None:
-            return
+            return False
         if self.dummy:
-            return
+            return False
 
         # All writes to the port should be protected by this lock to prevent interleaved messages
         self._port_write_lock.acquire()
@@ -116,18 +177,22 @@ class Display:
             if data is not None:
                 self.port.write(data)
             self.port.flush()
+            return True
         
         except serial.SerialTimeoutException as e:
             logging.debug(
                 f"{self.x},{self.y}: Timeout while writing. Waiting to write: {self.port.out_waiting}. Waiting to read: {self.port.in_waiting}", exc_info = e
             )
             self._close()
+            return False
         except serial.SerialException as e:
             logging.debug(f"{self.x},{self.y}: SerialException while writing.", exc_info = e)
             self._close()
+            return False
         except termios.error as e:
             logging.debug(f"{self.x},{self.y}: termios.error while writing.", exc_info = e)
             self._close()
+            return False
         except Exception as e:
             logging.debug(f"{self.x},{self.y}: Error while writing", exc_info = e)
             raise e # don't want to swallow the exception
@@ -148,6 +213,7 @@ class Display:
         self.write(header=b"multiverse:data", data=zeros)
         if self._thread is not None:
             self._buffer = zeros
+            self._buffer_dirty = True
 
     def bootloader(self):
         if self.port is None:
@@ -184,6 +250,7 @@ class Display:
             # It's also a copy, becauses of tobytes, so we don't need to worry about another thread
             # changing it on us
             self._buffer = buffer
+            self._buffer_dirty = True
         else:
             self.write(header=b"multiverse:data", data=buffer)
 
@@ -299,6 +366,24 @@ class Multiverse:
         for display in self.displays:
             display.update(buffer)
 
+    def pause(self):
+        for display in self.displays:
+            display.pause()
+
+    def resume(self):
+        for display in self.displays:
+            display.resume()
+
+    @property
+    def frame_rate(self):
+        """
+        Frames per second the slowest measured display link is accepting, or None if nothing has been measured
+        """
+        rates = [d.frame_rate for d in self.displays if not d.dummy and d.frame_rate is not None]
+        if not rates:
+            return None
+        return min(rates)
+
     def play_note(self, *args, **kwargs):
         for display in self.displays:
             display.play_note(*args, **kwargs)
@@ -0,0 +1,84 @@
+import time
+import logging
+
+
+class FrameScheduler:
+    """
+    Paces a loop against absolute frame deadlines on the perf_counter clock.
+
+    Every deadline is the previous deadline plus one frame period, so a frame
+    that runs long is paid back by the next one instead of drifting the whole
+    schedule. If the loop falls more than max_catch_up frames behind (a GC pause,
+    a serial reconnect, a game switch) the schedule is re-anchored to now rather
+    than bursting frames to catch up.
+
+    Waiting is a hybrid: sleep until spin_threshold seconds before the deadline,
+    then busy-wait the rest for sub-millisecond accuracy. Spinning costs CPU, so
+    it is only done for precise waits.
+    """
+
+    def __init__(self, spin_threshold: float = 0.002, max_catch_up: int = 2):
+        self.spin_threshold = spin_threshold
+        self.max_catch_up = max_catch_up
+        self.fps = None
+        self.period = 0.0
+        self.next_deadline = None
+        self.frame_count = 0
+        self.missed_deadlines = 0
+
+    def reset(self):
+        """
+        Forget the current schedule and statistics. The next wait starts a new schedule.
+        """
+        self.next_deadline = None
+        self.frame_count = 0
+        self.missed_deadlines = 0
+
+    def set_fps(self, fps: float):
+        if fps == self.fps:
+            return
+        logging.debug(f"Frame scheduler rate set to {fps} fps")
+        self.fps = fps
+        self.period = 1.0 / fps
+        # Changing rate invalidates the old deadlines
+        self.next_deadline = None
+
+    def wait(self, fps: float, precise: bool = False) -> bool:
+        """
+        Block until the deadline for the current frame.
+
+        Parameters:
+            fps: The target frame rate
+            precise: Spin for the last spin_threshold seconds instead of sleeping
+
+        Returns:
+            True if the deadline had already passed when wait was called
+        """
+        self.set_fps(fps)
+        now = time.perf_counter()
+        if self.next_deadline is None:
+            self.next_deadline = now + self.period
+
+        deadline = self.next_deadline
+        self.frame_count += 1
+
+        if now > deadline:
+            self.missed_deadlines += 1
+            if now - deadline > self.max_catch_up * self.period:
+                # Too far behind to catch up, start a fresh schedule from here
+                self.next_deadline = now + self.period
+            else:
+                self.next_deadline = deadline + self.period
+            return True
+
+        remaining = deadline - now
+        if precise:
+            if remaining > self.spin_threshold:
+                time.sleep(remaining - self.spin_threshold)
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            time.sleep(remaining)
+
+        self.next_deadline = deadline + self.period
+        return False
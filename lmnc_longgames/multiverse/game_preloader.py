@@ -0,0 +1,132 @@
+import logging
+import threading
+
+
+class GamePreloader:
+    """
+    Gets games ready to start on a background thread, so switching to them doesn't stall the main loop importing
+    their modules, opening video decoders or audio streams.
+
+    Games are keyed by (game name, args). The main loop says which games it expects to need next with want(), in
+    priority order, and the worker gets them ready one at a time: it resolves the game class through the game registry
+    and runs the class's prepare() hook with the game's args. Games are still constructed on the main thread by
+    whoever starts them, because constructors create surfaces, render text and convert sprites to the display format,
+    and pygame doesn't promise any of that works off the main thread. prepare() is for the rest.
+
+    take() hands over the game class and prepared resources, waiting for them if they're being got ready right now.
+    Prepared resources can only be used once, a game that's taken isn't prepared again until it drops out of the wanted
+    list and comes back. Resources that were prepared for games that are no longer wanted are released.
+    """
+
+    def __init__(self, game_registry, multiverse_display):
+        self.game_registry = game_registry
+        self.multiverse_display = multiverse_display
+        self._wanted = []
+        # Key to (game class, prepared resources) for the wanted games that are ready, or were taken
+        self._ready = {}
+        self._resolving = None
+        # Keys that failed to resolve, they aren't retried until they drop out of the wanted list
+        self._failed = set()
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    @staticmethod
+    def key(game_name, args=()):
+        return (game_name, tuple(args))
+
+    def want(self, keys):
+        """
+        Set the games that should be made ready ahead of time, most wanted first
+        """
+        keys = list(dict.fromkeys(keys))
+        with self._condition:
+            self._wanted = keys
+            self._failed.intersection_update(keys)
+            dropped = [self._ready.pop(key) for key in list(self._ready) if key not in keys]
+            if self._thread is None and keys and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="GamePreloader", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+        self._release(dropped)
+
+    def take(self, key, timeout: float = None):
+        """
+        Returns (game class, prepared resources) for key, or None if it isn't ready or being got ready. If it's being
+        got ready, wait up to timeout seconds for it. Taking it again returns the class with no resources.
+        """
+        with self._condition:
+            if key not in self._ready and self._resolving == key:
+                self._condition.wait_for(lambda: self._resolving != key, timeout)
+            ready = self._ready.get(key)
+            if ready is None:
+                return None
+            # The resources go to the caller, the class stays so the key isn't prepared again while it's wanted
+            self._ready[key] = (ready[0], None)
+            return ready
+
+    def stop(self):
+        """
+        Stop preloading and release anything that was prepared
+        """
+        with self._condition:
+            self._stopped = True
+            self._wanted = []
+            dropped = list(self._ready.values())
+            self._ready.clear()
+            self._condition.notify_all()
+        self._release(dropped)
+
+    def _release(self, ready):
+        for game_class, prepared in ready:
+            if prepared is None:
+                continue
+            try:
+                game_class.release_prepared(prepared)
+            except Exception as e:
+                logging.error(f"Exception while releasing prepared game {game_class}", exc_info=e)
+
+    def _next_key(self):
+        for key in self._wanted:
+            if key not in self._ready and key not in self._failed:
+                return key
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopped or self._next_key() is not None)
+                if self._stopped:
+                    return
+                key = self._next_key()
+                self._resolving = key
+
+            game_class = None
+            prepared = None
+            try:
+                logging.debug(f"Preloading game {key[0]}")
+                game_class = self.game_registry.resolve(key[0])
+            except Exception as e:
+                logging.error(f"Exception while preloading game {key[0]}", exc_info=e)
+            if game_class is not None:
+                try:
+                    prepare = getattr(game_class, "prepare", None)
+                    if prepare is not None:
+                        prepared = prepare(self.multiverse_display, *key[1])
+                except Exception as e:
+                    # The game can still be started, its constructor does the preparing
+                    logging.error(f"Exception while preparing game {key[0]}", exc_info=e)
+
+            with self._condition:
+                if game_class is None:
+                    self._failed.add(key)
+                elif key in self._wanted:
+                    self._ready[key] = (game_class, prepared)
+                    prepared = None
+            # No longer wanted while it was being prepared
+            if prepared is not None:
+                self._release([(game_class, prepared)])
+
+            with self._condition:
+                self._resolving = None
+                self._condition.notify_all()
@@ -0,0 +1,59 @@
+import importlib
+import logging
+import threading
+from importlib import metadata
+
+# Other packages can add games by publishing entry points in this group
+ENTRY_POINT_GROUP = "lmnc_longgames.games"
+
+
+class GameRegistry:
+    """
+    Resolves game names to game classes, importing their modules only when first needed.
+
+    A game is named either by a module path, "package.module:ClassName", or by the name of an entry point in the
+    lmnc_longgames.games group. Several game modules do heavy work at import time (audio, sprites, video), so the menu
+    holds names and the module is imported when the game is selected, or ahead of time by the GamePreloader.
+    """
+
+    def __init__(self):
+        self._games = {}
+        self._entry_points = None
+        self._lock = threading.Lock()
+
+    def _find_entry_point(self, name: str):
+        if self._entry_points is None:
+            eps = metadata.entry_points()
+            if hasattr(eps, "select"):
+                eps = eps.select(group=ENTRY_POINT_GROUP)
+            else:
+                # Python 3.9 returns a dict of groups
+                eps = eps.get(ENTRY_POINT_GROUP, [])
+            self._entry_points = {ep.name: ep for ep in eps}
+        entry_point = self._entry_points.get(name)
+        if entry_point is None:
+            raise LookupError(f"No game registered as '{name}'")
+        return entry_point
+
+    def resolve(self, name):
+        """
+        Returns the game class for name, importing it if needed. Classes are passed through unchanged.
+        """
+        if not isinstance(name, str):
+            return name
+
+        game = self._games.get(name)
+        if game is not None:
+            return game
+
+        module_path, _, class_name = name.partition(":")
+        if class_name:
+            game = getattr(importlib.import_module(module_path), class_name)
+        else:
+            with self._lock:
+                entry_point = self._find_entry_point(name)
+            game = entry_point.load()
+
+        logging.debug(f"Loaded game {name}")
+        self._games[name] = game
+        return game
@@ -10,12 +10,18 @@ except (ImportError, RuntimeError):
     os.environ["GPIOZERO_PIN_FACTORY"] = "mock"
 
 import random
+from collections import OrderedDict
 from typing import List
 from enum import Enum
 import pygame
 import numpy
 from lmnc_longgames.config import LongGameConfig
 from lmnc_longgames.multiverse import Multiverse, Display
+from lmnc_longgames.multiverse.frame_scheduler import FrameScheduler
+from lmnc_longgames.multiverse.output_governor import OutputGovernor
+from lmnc_longgames.multiverse.text_renderer import get_text_renderer
+from lmnc_longgames.multiverse.game_registry import GameRegistry
+from lmnc_longgames.multiverse.game_preloader import GamePreloader
 from lmnc_longgames.util.rotary_encoder_controller import RotaryEncoderController
 from lmnc_longgames.util.screen_power_reset import ScreenPowerReset
 from lmnc_longgames.constants import *
@@ -44,6 +50,8 @@ class PygameMultiverseDisplay:
         self.mute = False
         self.sound_trigger_out = DigitalOutputDevice(PIN_TRIGGER_OUT)
         self.flip_count = 0
+        self.output_governor = OutputGovernor()
+        self.paused = False
 
         logging.info(f"Initializing multiverse display")
         logging.info(f"upscale_factor: {upscale_factor}")
@@ -60,6 +68,7 @@ class PygameMultiverseDisplay:
 
         self.multiverse = Multiverse(*displays)
         self.multiverse.setup(use_threads=True)  # Starts the execution thread for the buffer
+        self.output_governor.reset()
         self.width = len(self.multiverse.displays) * 11 * self.upscale_factor
         self.height = 53 * self.upscale_factor
         logging.info(f"Upscaled Width: {self.width} Upscaled Height: {self.height}")
@@ -77,7 +86,7 @@ class PygameMultiverseDisplay:
                 )
             self.initial_configure_called = True
 
-    def flip_display(self):
+    def flip_display(self, force: bool = False):
 
         start = time.time()
         pygame.display.flip()
@@ -86,6 +95,13 @@ class PygameMultiverseDisplay:
         if self.flip_count % 100 == 0:
             logging.debug(f'pygame flip took {elapsed * 1000} ms')
 
+        # Don't bother encoding frames faster than the display links can take them
+        now = time.perf_counter()
+        self.output_governor.update(self.multiverse.frame_rate, now)
+        if not force and not self.output_governor.should_send(now):
+            self.flip_count += 1
+            return
+
         start = time.time()
         # This is a copy of the pixels into a new array
         framegrab = pygame.surfarray.array2d(self.pygame_screen)
@@ -104,6 +120,9 @@ class PygameMultiverseDisplay:
         elapsed = time.time() - start
         if self.flip_count % 100 == 0:
             logging.debug(f'multiverse update took {elapsed * 1000} ms')
+            logging.debug(
+                f'link frame rate: {self.multiverse.frame_rate}, output cap: {self.output_governor.cap}, skipped frames: {self.output_governor.skipped_frames}'
+            )
 
         self.flip_count += 1
 
@@ -116,6 +135,17 @@ class PygameMultiverseDisplay:
         self.multiverse.play_note(*args, **kwargs)
         #self.multiverse.play_note(0, 55, phase=Display.PHASE_OFF)
 
+    def pause(self):
+        """
+        Stop the displays from re-sending the current frame. Used while nothing on screen is changing.
+        """
+        self.paused = True
+        self.multiverse.pause()
+
+    def resume(self):
+        self.paused = False
+        self.multiverse.resume()
+
     def stop(self):
         self.multiverse.stop()
         
@@ -127,6 +157,16 @@ class PygameMultiverseDisplay:
         return len(self.multiverse.displays)
 
 class GameObject:
+    """
+    Something in the game with a float position and a pygame.Rect at the truncated integer position, for drawing and
+    collisions.
+
+    The base attributes are slotted. Subclasses that are created in bulk (bullets) can declare __slots__ for their
+    own attributes too, to drop the instance dict altogether.
+    """
+
+    __slots__ = ("game", "_rect", "_x", "_y")
+
     def __init__(self, game):
         self.game = game
         self._rect = pygame.Rect(0,0,0,0)
@@ -151,6 +191,14 @@ class GameObject:
     def y(self, value):
         self._y = value
         self._rect.y = int(value)
+
+    def set_position(self, x, y):
+        """
+        Move to x, y in one go. Cheaper than setting x and y separately in hot loops.
+        """
+        self._x = x
+        self._y = y
+        self._rect.topleft = (int(x), int(y))
     
     @property
     def width(self):
@@ -184,6 +232,58 @@ class GameObject:
             return self._rect.colliderect(other_object._rect)
         return False
 
+
+class EntityStore:
+    """
+    Many entities of one kind and size, kept as numpy arrays instead of a GameObject each, for games that move lots
+    of things at once.
+
+    Each entity is an index into the arrays. x and y are the float top left of every entity, and the rect edges are at
+    the truncated integer position, the same as GameObject. Subclasses add arrays for their own per entity state.
+    """
+
+    def __init__(self, game, count: int, width: int, height: int):
+        self.game = game
+        self.count = count
+        self.width = width
+        self.height = height
+        self.x = numpy.zeros(count)
+        self.y = numpy.zeros(count)
+
+    def set_position(self, which, x, y):
+        """
+        Move the entities selected by which (an index or mask) to x, y
+        """
+        self.x[which] = x
+        self.y[which] = y
+
+    def rect(self, index: int) -> pygame.Rect:
+        return pygame.Rect(int(self.x[index]), int(self.y[index]), self.width, self.height)
+
+    @property
+    def left(self) -> numpy.ndarray:
+        return self.x.astype(int)
+
+    @property
+    def top(self) -> numpy.ndarray:
+        return self.y.astype(int)
+
+    @property
+    def right(self) -> numpy.ndarray:
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> numpy.ndarray:
+        return self.top + self.height
+
+    @property
+    def centerx(self) -> numpy.ndarray:
+        return self.left + self.width // 2
+
+    @property
+    def centery(self) -> numpy.ndarray:
+        return self.top + self.height // 2
+
 class MultiverseGame:
     """
     Pygame Instance with display duplication to a multiverse display (collection of unicorn displays)
@@ -194,14 +294,23 @@ class MultiverseGame:
 
     The game loop will draw the next frame of the game. The dt will be passed into this loop so frame independent math can be used.
 
+    Games can instead pass a sim_fps to run their simulation on a fixed timestep. They implement update(events, dt),
+    which is called with a constant dt as many times as needed to catch up with real time, and draw(alpha), which is
+    called once per output frame. alpha is how far real time has progressed between the last two simulation steps,
+    for games that want to interpolate. The output frame rate (fps) is then independent of the simulation rate and can
+    be overridden with "output_fps" in the config.
+
     """
 
+    # Upper bound on simulation steps per output frame, so a long stall can't snowball
+    MAX_SIM_STEPS_PER_FRAME = 8
+
     def __init__(
-        self, game_title: str, fps: int, multiverse_display: PygameMultiverseDisplay, fixed_fps = False
+        self, game_title: str, fps: int, multiverse_display: PygameMultiverseDisplay, fixed_fps = False, sim_fps: int = None
     ) -> None:
         self.multiverse_display = multiverse_display
-        script_path = os.path.realpath(os.path.dirname(__file__))
-        self.font = pygame.font.Font(f"{script_path}/../icl8x8u.bdf", 8)
+        self.text_renderer = get_text_renderer()
+        self.font = self.text_renderer.font
         self.game_title = game_title
         self.fps = fps
         self.fixed_fps = fixed_fps
@@ -211,11 +320,22 @@ class MultiverseGame:
         self.reset_input_history(P1)
         self.reset_input_history(P2)
         self.exit_game_flag = False
+        self.suspended = False
 
         self.config = LongGameConfig()
 
+        self.sim_fps = sim_fps
+        if sim_fps is not None:
+            self.sim_dt = 1.0 / sim_fps
+            # Start with a full step banked so the first frame always has something to draw
+            self.sim_accumulator = self.sim_dt
+            self._pending_events = []
+            self.fps = self.config.config.get("output_fps", fps)
+
         logging.info(f"Initializing game {self.game_title}")
-        logging.info(f"fps: {fps}")
+        logging.info(f"fps: {self.fps}")
+        if sim_fps is not None:
+            logging.info(f"sim_fps: {sim_fps}")
 
     @property
     def upscale_factor(self):
@@ -240,6 +360,12 @@ class MultiverseGame:
     def play_note(self, *args, **kwargs):
         self.multiverse_display.play_note(*args, **kwargs)
 
+    def render_text(self, text: str, color=WHITE) -> pygame.Surface:
+        """
+        Returns text rendered in the game font at the display's upscale factor. The surface is cached, don't draw on it.
+        """
+        return self.text_renderer.render(text, color, self.upscale_factor)
+
     def update_history(self, controller, event):
         history = self.p1_input_history if controller == P1 else self.p2_input_history
         if event[0] in [ROTATED_CW, ROTATED_CCW] and history[-1] == event:
@@ -253,20 +379,84 @@ class MultiverseGame:
         history_slice  = history[-len(to_check):]
         return history_slice == to_check
 
+    @classmethod
+    def prepare(cls, multiverse_display: PygameMultiverseDisplay, *args):
+        """
+        Do the slow part of starting the game that doesn't touch pygame, like opening a video decoder or an audio
+        stream, so it can be done ahead of time on the preloader thread.
+
+        Called with the constructor's arguments. Whatever is returned is passed to the constructor as prepared, games
+        that override this must accept it. Returns None if there's nothing to prepare.
+        """
+        return None
+
+    @classmethod
+    def release_prepared(cls, prepared):
+        """
+        Let go of a prepare() result that's not going to be used
+        """
+        pass
+
     def exit_game(self):
         self.exit_game_flag = True
 
     def teardown(self):
         pass
 
+    def suspend(self, release_resources: bool = False):
+        """
+        Called when the game is put aside with its state intact, to be resumed later (or torn down if it's evicted).
+
+        Override to stop anything that keeps running between frames. If release_resources is set, also let go of
+        external resources (audio streams, video decoders) and reacquire them in resume.
+        """
+        self.suspended = True
+
+    def resume(self):
+        """
+        Called when a suspended game is picked up again
+        """
+        self.suspended = False
+
     def loop(self, events, dt):
-        """1    
-        Override this method for the game loop
+        """
+        Override this method for the game loop, or set sim_fps and override update and draw instead
         """
         for event in events:
             if event.type in [ROTATED_CW, ROTATED_CCW, BUTTON_RELEASED]:
                 self.update_history(event.controller, (event.type, event.input))
 
+        if self.sim_fps is None:
+            return
+
+        self._pending_events.extend(events)
+        max_backlog = self.MAX_SIM_STEPS_PER_FRAME * self.sim_dt
+        self.sim_accumulator = min(self.sim_accumulator + dt, max_backlog)
+
+        while self.sim_accumulator >= self.sim_dt:
+            # Events are only delivered once, to the first step that runs after they arrived
+            step_events = self._pending_events
+            self._pending_events = []
+            self.update(step_events, self.sim_dt)
+            self.sim_accumulator -= self.sim_dt
+
+        self.draw(self.sim_accumulator / self.sim_dt)
+
+    def update(self, events, dt):
+        """
+        Override this method to advance a fixed timestep game by one simulation step of dt seconds
+        """
+        pass
+
+    def draw(self, alpha):
+        """
+        Override this method to draw a fixed timestep game.
+
+        Parameters:
+            alpha: Fraction (0-1) of a simulation step that has elapsed since the last update, for interpolation
+        """
+        pass
+
     def reset(self):
         """
         Override this method for game reset
@@ -300,10 +490,7 @@ class MultiverseGame:
         for i in range(3, 0, -1):
             logging.info(i)
             self.screen.fill(BLACK)
-            countdown_text = self.font.render(str(i), False, WHITE)
-            countdown_text = pygame.transform.scale_by(
-                countdown_text, self.upscale_factor
-            )
+            countdown_text = self.render_text(str(i))
 
             self.screen.blit(
                 countdown_text,
@@ -324,6 +511,24 @@ class MultiverseGame:
         logging.info("GO!")
 
 
+LONG_PONG = "lmnc_longgames.games.longpong:LongPongGame"
+SNAKE = "lmnc_longgames.games.snake:SnakeGame"
+FIRE_DEMO = "lmnc_longgames.demos.fire_demo:FireDemo"
+MATRIX_DEMO = "lmnc_longgames.demos.matrix_demo:MatrixDemo"
+LIFE_DEMO = "lmnc_longgames.demos.life_demo:LifeDemo"
+MARQUEE_DEMO = "lmnc_longgames.demos.marquee_demo:MarqueeDemo"
+
+# Games the demo disc picks from when the menu has been left alone, as (game, args)
+DEMO_DISC = [
+    (LONG_PONG, [0]),
+    (SNAKE, [0]),
+    (FIRE_DEMO, []),
+    (MATRIX_DEMO, []),
+    (LIFE_DEMO, []),
+    (MARQUEE_DEMO, ["Special Thanks"]),
+]
+
+
 class MenuItem:
     def __init__(self, name: str, children: list = None, props: dict = {}, parent = None):
         self.name = name
@@ -366,13 +571,21 @@ class MultiverseMain:
             "Multiverse Games", upscale_factor, headless
         )
         self.multiverse_display.configure_display()
-        self.clock = pygame.time.Clock()
+        self.frame_scheduler = FrameScheduler()
         self.game = None
+        # (game name, args) of the current game
+        self.game_key = None
         self.menu_inactive_start_time = time.time()
         self.running_demo = False
         self.demo_start_time = self.menu_inactive_start_time
-        script_path = os.path.realpath(os.path.dirname(__file__))
-        self.font = pygame.font.Font(f"{script_path}/../icl8x8u.bdf", size=8)
+        self.text_renderer = get_text_renderer()
+
+        # The menu only changes on input, so keep the last composed menu frame around
+        self._menu_frame = None
+        self._menu_frame_key = None
+        self._menu_frame_on_screen = False
+        # Set while the menu is static, the main loop then waits for input instead of redrawing
+        self.idle = False
 
         config = LongGameConfig()
 
@@ -399,19 +612,17 @@ class MultiverseMain:
 
         # TODO: Console Controls (Restart, back to menu, etc)
 
-        from lmnc_longgames.games.longpong import LongPongGame
-        from lmnc_longgames.games.snake import SnakeGame
-        from lmnc_longgames.games.breakout import BreakoutGame
+        # Games are named by module path and only imported when selected (or preloaded)
+        self.game_registry = GameRegistry()
+        # Gets the games that are likely to be started next (highlighted menu item, next demo) ready in the background
+        self.game_preloader = GamePreloader(self.game_registry, self.multiverse_display)
+        self._preload_keys = None
+        self.next_demo = random.choice(DEMO_DISC)
 
-        from lmnc_longgames.sound.spectrum import SpectrumAnalyzer
-        from lmnc_longgames.sound.waveform import Waveform
-        from lmnc_longgames.demos.fire_demo import FireDemo
-        from lmnc_longgames.demos.matrix_demo import MatrixDemo
-        from lmnc_longgames.demos.life_demo import LifeDemo
-        from lmnc_longgames.demos.video_demo import VideoDemo
-        from lmnc_longgames.demos.marquee_demo import MarqueeDemo
-        from lmnc_longgames.games.invaders import InvadersGame
-        from lmnc_longgames.games.combat import CombatGame
+        # Games that were left rather than finished, by (game name, args), least recently used first
+        self.suspended_games = OrderedDict()
+        # Suspended games let go of audio streams and video decoders unless configured otherwise
+        self.release_suspended_resources = config.config.get("release_suspended_resources", True)
 
         self.game_menu = MenuItem(
             "Long Games",
@@ -420,29 +631,32 @@ class MultiverseMain:
                     "Long Pong",
                     [
                         MenuItem(
-                            "1 Player", props={"constructor": LongPongGame, "args": [1]}
+                            "1 Player", props={"game": LONG_PONG, "args": [1]}
+                        ),
+                        MenuItem(
+                            "2 Player", props={"game": LONG_PONG, "args": [2]}
                         ),
                         MenuItem(
-                            "2 Player", props={"constructor": LongPongGame, "args": [2]}
+                            "AI vs AI", props={"game": LONG_PONG, "args": [0]}
                         ),
                         MenuItem(
-                            "AI vs AI", props={"constructor": LongPongGame, "args": [0]}
+                            "Multi-ball", props={"game": LONG_PONG, "args": [1, 10]}
                         ),
                         MenuItem("Back"),
                     ],
                 ),
-                MenuItem("Snake", props={"constructor": SnakeGame}),
-                MenuItem("Breakout", props={"constructor": BreakoutGame}),
-                MenuItem("Invaders", props={"constructor": InvadersGame}),
-                MenuItem("Combat", props={"constructor": CombatGame}),
-                MenuItem("Spectrum Analyzer", props={"constructor": SpectrumAnalyzer}),
-                MenuItem("Waveform", props={"constructor": Waveform}),
+                MenuItem("Snake", props={"game": SNAKE}),
+                MenuItem("Breakout", props={"game": "lmnc_longgames.games.breakout:BreakoutGame"}),
+                MenuItem("Invaders", props={"game": "lmnc_longgames.games.invaders:InvadersGame"}),
+                MenuItem("Combat", props={"game": "lmnc_longgames.games.combat:CombatGame"}),
+                MenuItem("Spectrum Analyzer", props={"game": "lmnc_longgames.sound.spectrum:SpectrumAnalyzer"}),
+                MenuItem("Waveform", props={"game": "lmnc_longgames.sound.waveform:Waveform"}),
                 MenuItem(
                     "Demos",
                     [
-                        MenuItem("Fire", props={"constructor": FireDemo}),
-                        MenuItem("Matrix", props={"constructor": MatrixDemo}),
-                        MenuItem("Life", props={"constructor": LifeDemo}),
+                        MenuItem("Fire", props={"game": FIRE_DEMO}),
+                        MenuItem("Matrix", props={"game": MATRIX_DEMO}),
+                        MenuItem("Life", props={"game": LIFE_DEMO}),
                         MenuItem("Back"),
                     ],
                 )
@@ -462,12 +676,12 @@ class MultiverseMain:
         '''
         video_config = config.config.get("videos",[])
 
-        video_items = [MenuItem(v.get('name'), props={"constructor": VideoDemo, "args":[v.get('path')]}) for v in video_config]
+        video_items = [MenuItem(v.get('name'), props={"game": "lmnc_longgames.demos.video_demo:VideoDemo", "args":[v.get('path')]}) for v in video_config]
         if(len(video_items)):
             video_items.append(MenuItem("Back"))
             self.game_menu.children.append(MenuItem("Videos", video_items, parent=self.game_menu))
 
-        self.game_menu.children.append(MenuItem("Special Thanks", parent=self.game_menu, props={"constructor": MarqueeDemo, "args": ["Special Thanks"]}))
+        self.game_menu.children.append(MenuItem("Special Thanks", parent=self.game_menu, props={"game": MARQUEE_DEMO, "args": ["Special Thanks"]}))
         
         signal.signal(signal.SIGINT, self.signal_handler)
 
@@ -495,6 +709,10 @@ class MultiverseMain:
     def stop(self):
         logging.debug("Stopping Game")
         self.exit_flag.set()
+        self.game_preloader.stop()
+        while self.suspended_games:
+            _, game = self.suspended_games.popitem(last=False)
+            game.teardown()
         logging.debug("Stopping Multiverse")
         self.multiverse_display.stop()
         logging.debug("Quitting Pygame")
@@ -504,6 +722,29 @@ class MultiverseMain:
         if self.game is not None:
             self.game.teardown()
             self.game = None
+            self.game_key = None
+
+    def suspend_game(self):
+        """
+        Put the current game aside so it can be resumed where it was left. Games that asked to exit are torn down,
+        and so are demos, which nobody chose to play and which shouldn't push the user's games out of the cache.
+        """
+        if self.game is None:
+            return
+        if self.game.exit_game_flag or self.running_demo:
+            self.teardown_game()
+            return
+
+        self.game.suspend(self.release_suspended_resources)
+        self.suspended_games[self.game_key] = self.game
+        self.suspended_games.move_to_end(self.game_key)
+        self.game = None
+        self.game_key = None
+
+        while len(self.suspended_games) > SUSPENDED_GAME_CACHE_SIZE:
+            key, game = self.suspended_games.popitem(last=False)
+            logging.debug(f"Evicting suspended game {key[0]}")
+            game.teardown()
 
     def reset_game(self):
         if self.game is not None:
@@ -516,13 +757,13 @@ class MultiverseMain:
 
     def run(self):
         self.exit_flag.clear()
-        previous_frame_start_time = time.time()
+        previous_frame_start_time = time.perf_counter()
 
         game_start_time = None
 
-        while not self.exit_flag.wait(0.001):
+        while not self.exit_flag.is_set():
             
-            frame_start_time = time.time()
+            frame_start_time = time.perf_counter()
             self.dt = frame_start_time - previous_frame_start_time
             previous_frame_start_time = frame_start_time
 
@@ -532,14 +773,20 @@ class MultiverseMain:
                 self.menu_inactive_start_time = time.time()
                 self.running_demo = False
 
-            if self.running_demo and frame_start_time > (self.demo_start_time + DEMO_SWITCH_TIME):
+            if self.running_demo and time.time() > (self.demo_start_time + DEMO_SWITCH_TIME):
                 #change the demo
                 self.load_demo_disc()
 
 
             start = time.time()
             # Get all events
-            events = pygame.event.get()
+            if self.idle:
+                events = self.wait_for_events()
+                # Time spent blocked while idle isn't frame time, don't charge it to the next frame's dt
+                frame_start_time = time.perf_counter()
+                previous_frame_start_time = frame_start_time
+            else:
+                events = pygame.event.get()
 
             # Check for quit
             for event in events:
@@ -550,7 +797,7 @@ class MultiverseMain:
                     self.exit_flag.set()
                     continue
                 if self.running_demo and event.type in [pygame.KEYUP, BUTTON_RELEASED, ROTATED_CW, ROTATED_CCW]:
-                    self.teardown_game()
+                    self.suspend_game()
                     self.menu_inactive_start_time = time.time()
                     self.running_demo = False
                     continue
@@ -564,7 +811,7 @@ class MultiverseMain:
                 if (event.type == pygame.KEYUP and event.key == pygame.K_m) or (
                     event.type == BUTTON_RELEASED and event.input == BUTTON_MENU
                 ):
-                    self.teardown_game()
+                    self.suspend_game()
                     self.menu_inactive_start_time = time.time()
                     continue
             elapsed = time.time() - start
@@ -576,85 +823,110 @@ class MultiverseMain:
                 # Show game selection menu
                 self.menu_loop(events, self.dt)
             else:
+                # The game owns the screen now, the menu will need to be redrawn
+                self._menu_frame_on_screen = False
+                self.idle = False
 
                 start = time.time()
                 if game_start_time is None:
-                    game_start_time = time.time()
+                    game_start_time = time.perf_counter()
                     frame_start_time = game_start_time
                     self.game.frame_count = 0
+                    self.frame_scheduler.reset()
                 self.game.loop(events, self.dt)
                 elapsed = time.time() - start
                 if self.game is not None and self.game.frame_count % 100 == 0:
                     logging.debug(f'game loop took {elapsed * 1000} ms')
 
                 self.game.frame_count += 1
+
+            self.update_preloads()
                 
             # Update the display            
             start = time.time()
-            self.multiverse_display.flip_display()
+            if self.idle:
+                if not self.multiverse_display.paused:
+                    # Nothing is changing, make sure the last frame made it out then stop transmitting
+                    self.multiverse_display.flip_display(force=True)
+                    self.multiverse_display.pause()
+            else:
+                if self.multiverse_display.paused:
+                    self.multiverse_display.resume()
+                self.multiverse_display.flip_display()
             elapsed = time.time() - start
             
             if self.game is not None and self.game.frame_count % 100 == 1:
                 logging.debug(f'flip_display took {elapsed * 1000} ms')
 
-            frame_elapsed_time = time.time() - frame_start_time
+            frame_elapsed_time = time.perf_counter() - frame_start_time
 
             if self.game is not None and self.game.frame_count % 100 == 1:
                 logging.debug(f'frame_elapsed_time took {frame_elapsed_time * 1000} ms')
 
             if self.game is not None and game_start_time is not None:
-                game_elapsed_time = time.time() - game_start_time
+                game_elapsed_time = time.perf_counter() - game_start_time
                 observed_fps = self.game.frame_count / game_elapsed_time
                 if self.game.frame_count % 100 == 1:
                     logging.debug(f"Observed FPS: {observed_fps}")
-
-                if  self.game.fixed_fps:
-                    # Hacky attempt to keep a fixed-ish framerate
-                    # Added specifically for video playback
-                    fps_delay = 1000/(self.game.fps + 5)
-                    frame_draw_delay = frame_elapsed_time * 1000
-                    sync_offset = 0
-                    if(observed_fps < self.game.fps):
-                        #speed up
-                        sync_offset = - fps_delay / 2
-                    elif observed_fps > self.game.fps:
-                        #slow down
-                        sync_offset = fps_delay / 2
-                        
-                    actual_delay = max(0, fps_delay - frame_draw_delay + sync_offset)
-                    
-                    if self.game.frame_count % 100 == 1:
-                        logging.debug(f'FPS Delay: {fps_delay}, frame_draw_delay: {frame_draw_delay}, actual_delay: {actual_delay}')                        
-                    
-                    pygame.time.delay(int(actual_delay))
-                    #time.sleep(actual_delay / 1000)
-                else: # Basic frame limiting
-                    # Set the frame rate
-                    self.clock.tick(self.game.fps if self.game is not None else 120)
-            else:
+                    logging.debug(
+                        f"Missed frame deadlines: {self.frame_scheduler.missed_deadlines}/{self.frame_scheduler.frame_count}"
+                    )
+
+                # Games asking for a fixed frame rate (video, audio visualizers) get the
+                # precise sleep-then-spin wait, everything else just sleeps to the deadline
+                self.frame_scheduler.wait(self.game.fps, precise=self.game.fixed_fps)
+            elif not self.idle:
                 # No game right now, not sure why were here but lets keep that train a' rolling
-                self.clock.tick(120)
+                # (when idle, waiting for events does the pacing)
+                self.frame_scheduler.wait(MENU_FPS)
 
         logging.info("Ended multiverse game run loop")
         self.stop()
 
+    def wait_for_events(self):
+        """
+        Block until an event arrives, or until the next scheduled menu change (the demo disc starting).
+
+        The wait is capped at MAX_IDLE_WAIT so the exit flag and signals are still noticed promptly.
+        """
+        until_demo = self.menu_inactive_start_time + MAX_MENU_INACTIVE_TIME - time.time()
+        timeout = min(until_demo, MAX_IDLE_WAIT)
+        event = pygame.event.wait(max(1, int(timeout * 1000)))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def start_game(self, game_name, args, resume: bool = True):
+        """
+        Make the named game current. If resume is set, a suspended instance is resumed if there is one. Otherwise a
+        new one is built here, from the preloaded class and prepared resources if they're ready.
+        """
+        key = GamePreloader.key(game_name, args)
+        game = self.suspended_games.pop(key, None) if resume else None
+        if game is not None:
+            logging.debug(f"Resuming suspended game {game_name}")
+            game.resume()
+        else:
+            ready = self.game_preloader.take(key)
+            if ready is None:
+                ready = (self.game_registry.resolve(game_name), None)
+            game_class, prepared = ready
+            if prepared is None:
+                game = game_class(self.multiverse_display, *args)
+            else:
+                game = game_class(self.multiverse_display, *args, prepared=prepared)
+
+        self.game = game
+        self.game_key = key
+
     def load_demo_disc(self):
-        from lmnc_longgames.demos.fire_demo import FireDemo
-        from lmnc_longgames.demos.matrix_demo import MatrixDemo
-        from lmnc_longgames.demos.life_demo import LifeDemo
-        from lmnc_longgames.games.longpong import LongPongGame
-        from lmnc_longgames.demos.marquee_demo import MarqueeDemo
-
-        options = [
-            (LongPongGame, [0]),
-            (FireDemo, []),
-            (MatrixDemo, []),
-            (LifeDemo, []),
-            (MarqueeDemo, ["Special Thanks"]),
-        ]
-        game_class, args = random.choice(options)
+        game_name, args = self.next_demo
+        self.next_demo = random.choice(DEMO_DISC)
 
-        self.game = game_class(self.multiverse_display, *args)
+        # Switching demos replaces the one that's running
+        self.teardown_game()
+        # Demos always start fresh, a game the user suspended with the same key is left for them to come back to
+        self.start_game(game_name, args, resume=False)
         self.demo_start_time = time.time()
         self.running_demo = True
 
@@ -667,13 +939,31 @@ class MultiverseMain:
             logging.info(f"Selected menu leaf {game_name}")
 
             args = selected_child.props.get("args", [])
-            self.game = selected_child.props["constructor"](
-                self.multiverse_display, *args
-            )
+            self.start_game(selected_child.props["game"], args)
             self.game_menu = selected_child.parent
         else:
             self.game_menu = selected_child
 
+    def update_preloads(self):
+        """
+        Keep the games that could be started next preloading: the highlighted menu item (a good bet it's about to be
+        picked) and the next demo disc game. Nothing is preloaded while a game is being played, for games that are
+        suspended, or for the game that's running.
+        """
+        keys = []
+        if self.game is None:
+            highlighted = self.game_menu.children[self.game_menu.highlighted_index]
+            if highlighted.children is None and "game" in highlighted.props:
+                keys.append(GamePreloader.key(highlighted.props["game"], highlighted.props.get("args", [])))
+        if self.game is None or self.running_demo:
+            keys.append(GamePreloader.key(*self.next_demo))
+
+        # Suspended games are resumed rather than started, and the current game is already running
+        keys = [key for key in keys if key not in self.suspended_games and key != self.game_key]
+        if keys != self._preload_keys:
+            self._preload_keys = keys
+            self.game_preloader.want(keys)
+
     def menu_loop(self, events, dt):
         elapsed_menu_time = time.time() - self.menu_inactive_start_time
         if elapsed_menu_time > MAX_MENU_INACTIVE_TIME:
@@ -681,6 +971,7 @@ class MultiverseMain:
                 f"Menu time elapsed, starting random demo after {MAX_MENU_INACTIVE_TIME} seconds"
             )
             self.load_demo_disc()
+            self.idle = False
             return
 
         highlight_change = 0
@@ -709,41 +1000,66 @@ class MultiverseMain:
 
         self.game_menu.highlight(self.game_menu.highlighted_index + highlight_change)
 
+        screen = self.multiverse_display.pygame_screen
+        # The screen and upscale are part of the key, a rebuilt or rescaled display needs the frame composed again
+        menu_key = (
+            self.game_menu,
+            self.game_menu.highlighted_index,
+            screen,
+            screen.get_size(),
+            self.multiverse_display.upscale_factor,
+        )
+        if menu_key != self._menu_frame_key:
+            self._menu_frame = self.render_menu_frame()
+            self._menu_frame_key = menu_key
+            self._menu_frame_on_screen = False
+
+        redrawn = False
+        if not self._menu_frame_on_screen:
+            screen.blit(self._menu_frame, (0, 0))
+            self._menu_frame_on_screen = True
+            redrawn = True
+
+        self.idle = not redrawn and not events and self.game is None
+
+    def render_menu_label(self, text: str) -> pygame.Surface:
+        return self.text_renderer.render(text, WHITE, self.multiverse_display.upscale_factor)
+
+    def render_menu_frame(self) -> pygame.Surface:
+        """
+        Compose the full screen image of the current menu with the current item highlighted
+        """
         # Show the current menu
         to_display = self.game_menu.get_display_list()
 
-        screen = self.multiverse_display.pygame_screen
         width = self.multiverse_display.width
         upscale_factor = self.multiverse_display.upscale_factor
 
-        screen.fill(BLACK)
+        frame = pygame.Surface(self.multiverse_display.pygame_screen.get_size())
+        frame.fill(BLACK)
         center_screen = width // 2
 
-        title_text = self.font.render(f"__{self.game_menu.name}__", False, WHITE)
-        title_text = pygame.transform.scale_by(title_text, upscale_factor)
-        screen.blit(
+        title_text = self.render_menu_label(f"__{self.game_menu.name}__")
+        frame.blit(
             title_text,
             (center_screen - title_text.get_width() // 2, 5 * upscale_factor),
         )
 
         render_index = 0
         for i, child in to_display:
-            text = child.name
-            child_text = self.font.render(text, False, WHITE)
-            child_text = pygame.transform.scale_by(child_text, upscale_factor)
+            child_text = self.render_menu_label(child.name)
             text_x = center_screen - child_text.get_width() // 2
             text_y = (15 + (10 * render_index)) * upscale_factor
-            screen.blit(child_text, (text_x, text_y))
+            frame.blit(child_text, (text_x, text_y))
 
             if self.game_menu.highlighted_index == i:
-                indicator_text = self.font.render(">", False, WHITE)
-                indicator_text = pygame.transform.scale_by(
-                    indicator_text, upscale_factor
-                )
-                screen.blit(indicator_text, (text_x - (10 * upscale_factor), text_y))
+                indicator_text = self.render_menu_label(">")
+                frame.blit(indicator_text, (text_x - (10 * upscale_factor), text_y))
 
             render_index += 1
 
+        return frame
+
 
 def main():
     # Constants/Configuration
@@ -0,0 +1,74 @@
+import logging
+
+
+class OutputGovernor:
+    """
+    Caps how often frames are handed to the multiverse, based on how fast the display links are measured to accept them.
+
+    Frames rendered faster than the slowest link can write are never seen, they only cost downsampling and encoding
+    and pile up latency. The cap follows the measured link rate (scaled by headroom), but only moves once the measured
+    rate has stayed more than hysteresis away from the current cap for settle_time seconds, so it doesn't hunt.
+    """
+
+    def __init__(
+        self,
+        min_fps: float = 15,
+        headroom: float = 0.95,
+        hysteresis: float = 0.1,
+        settle_time: float = 1.0,
+        tolerance: float = 0.002,
+    ):
+        self.min_fps = min_fps
+        self.headroom = headroom
+        self.hysteresis = hysteresis
+        self.settle_time = settle_time
+        self.tolerance = tolerance
+        self.cap = None
+        self.next_send = None
+        self.skipped_frames = 0
+        self._change_pending_since = None
+
+    def reset(self):
+        self.cap = None
+        self.next_send = None
+        self.skipped_frames = 0
+        self._change_pending_since = None
+
+    def update(self, measured_fps, now: float):
+        """
+        Feed in the latest measured link frame rate (None if unknown)
+        """
+        if measured_fps is None:
+            self._change_pending_since = None
+            return
+
+        target = max(self.min_fps, measured_fps * self.headroom)
+        if self.cap is not None and abs(target - self.cap) <= self.cap * self.hysteresis:
+            self._change_pending_since = None
+            return
+
+        if self._change_pending_since is None:
+            self._change_pending_since = now
+        elif now - self._change_pending_since >= self.settle_time:
+            logging.info(f"Output frame rate cap changed from {self.cap} to {target:.1f} fps")
+            self.cap = target
+            self._change_pending_since = None
+
+    def should_send(self, now: float) -> bool:
+        """
+        Returns True if a frame produced at now should be sent to the displays
+        """
+        if self.cap is None:
+            return True
+
+        period = 1.0 / self.cap
+        if self.next_send is not None and now + self.tolerance < self.next_send:
+            self.skipped_frames += 1
+            return False
+
+        if self.next_send is None or now - self.next_send > period:
+            # Fell well behind the cap, don't try to make it up
+            self.next_send = now + period
+        else:
+            self.next_send += period
+        return True
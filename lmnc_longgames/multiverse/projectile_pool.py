@@ -0,0 +1,94 @@
+class ProjectilePool:
+    """
+    A fixed number of projectiles (bullets, shots) that are reused instead of being created for every shot.
+
+    All the projectiles are made up front by factory. They need an active attribute and a spawn(*args) method that
+    puts them back in play (position, direction, ...). spawn() hands out a free projectile, or None if they're all in
+    play, and despawn() marks one for return. Despawned projectiles are returned to the free list by sweep(), so it's
+    safe to despawn while iterating.
+
+    Iterating the pool gives the projectiles in play, in the order they were spawned. Projectiles spawned while
+    iterating are included.
+    """
+
+    def __init__(self, factory, capacity: int):
+        self.capacity = capacity
+        self._free = [factory() for _ in range(capacity)]
+        for projectile in self._free:
+            projectile.active = False
+        self._active = []
+        self._despawned = False
+
+    def __iter__(self):
+        return (projectile for projectile in self._active if projectile.active)
+
+    def __len__(self):
+        return len(self._active)
+
+    def spawn(self, *args, **kwargs):
+        """
+        Put a projectile into play, returns None if the pool is exhausted
+        """
+        if not self._free:
+            return None
+        projectile = self._free.pop()
+        projectile.spawn(*args, **kwargs)
+        projectile.active = True
+        self._active.append(projectile)
+        return projectile
+
+    def despawn(self, projectile):
+        if projectile.active:
+            projectile.active = False
+            self._despawned = True
+
+    def sweep(self):
+        """
+        Return despawned projectiles to the free list. Call once per frame.
+        """
+        if not self._despawned:
+            return
+        self._despawned = False
+        active = []
+        for projectile in self._active:
+            if projectile.active:
+                active.append(projectile)
+            else:
+                self._free.append(projectile)
+        self._active = active
+
+    def clear(self):
+        """
+        Take every projectile out of play
+        """
+        for projectile in self._active:
+            projectile.active = False
+        self._free.extend(self._active)
+        self._active = []
+        self._despawned = False
+
+
+class AnimationClock:
+    """
+    Steps through an animation's frames at a fixed frame time.
+
+    One clock is shared by everything showing the same animation (all the bullets of a kind), so each object only
+    needs to look up frame when drawing.
+    """
+
+    def __init__(self, frame_time: float, frame_count: int):
+        self.frame_time = frame_time
+        self.frame_count = frame_count
+        self.frame = 0
+        self._elapsed = 0.0
+
+    def update(self, dt: float):
+        self._elapsed += dt
+        if self._elapsed >= self.frame_time:
+            steps = int(self._elapsed // self.frame_time)
+            self._elapsed -= steps * self.frame_time
+            self.frame = (self.frame + steps) % self.frame_count
+
+    def reset(self):
+        self.frame = 0
+        self._elapsed = 0.0
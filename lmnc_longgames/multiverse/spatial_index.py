@@ -0,0 +1,120 @@
+from typing import Dict, Hashable, Iterable, List, Tuple
+import pygame
+
+
+class SpatialHash:
+    """
+    Finds the objects overlapping a rect without testing every object, by bucketing them into a uniform grid of
+    cells.
+
+    Objects are registered with a rect and listed in every cell the rect touches. The index keeps the rect it was
+    given rather than a copy, so pass the object's own rect and call update() after the object moves. update() only
+    touches the buckets when the object has moved into different cells.
+
+    Queries gather candidates from the cells the query rect touches, then test them exactly against their rects.
+    Cells are a dict keyed by (column, row), so objects can be anywhere, including off screen.
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        # Ordered dicts standing in for sets, so query results come back in a stable order
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, None]] = {}
+        self._rects: Dict[Hashable, pygame.Rect] = {}
+        self._spans: Dict[Hashable, Tuple[int, int, int, int]] = {}
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, obj):
+        return obj in self._rects
+
+    def _span(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            max(rect.right - 1, rect.left) // size,
+            max(rect.bottom - 1, rect.top) // size,
+        )
+
+    def _add(self, obj, span):
+        left, top, right, bottom = span
+        cells = self._cells
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                bucket = cells.get((column, row))
+                if bucket is None:
+                    bucket = cells[(column, row)] = {}
+                bucket[obj] = None
+
+    def _discard(self, obj, span):
+        left, top, right, bottom = span
+        cells = self._cells
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                bucket = cells[(column, row)]
+                del bucket[obj]
+                if not bucket:
+                    del cells[(column, row)]
+
+    def insert(self, obj, rect: pygame.Rect):
+        """
+        Register obj at rect, or move it there if it's already registered
+        """
+        if obj in self._rects:
+            self.update(obj, rect)
+            return
+        span = self._span(rect)
+        self._rects[obj] = rect
+        self._spans[obj] = span
+        self._add(obj, span)
+
+    def update(self, obj, rect: pygame.Rect = None):
+        """
+        Re-bucket obj after it moved. rect replaces its registered rect if given.
+        """
+        if rect is not None:
+            self._rects[obj] = rect
+        span = self._span(self._rects[obj])
+        old_span = self._spans[obj]
+        if span == old_span:
+            return
+        self._discard(obj, old_span)
+        self._add(obj, span)
+        self._spans[obj] = span
+
+    def remove(self, obj):
+        """
+        Unregister obj, if it's registered
+        """
+        span = self._spans.pop(obj, None)
+        if span is None:
+            return
+        del self._rects[obj]
+        self._discard(obj, span)
+
+    def clear(self):
+        self._cells.clear()
+        self._rects.clear()
+        self._spans.clear()
+
+    def query(self, rect: pygame.Rect) -> List:
+        """
+        Returns the objects whose rects overlap rect
+        """
+        left, top, right, bottom = self._span(rect)
+        cells = self._cells
+        rects = self._rects
+        found = {}
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                bucket = cells.get((column, row))
+                if bucket:
+                    found.update(bucket)
+        return [obj for obj in found if rects[obj].colliderect(rect)]
+
+    def query_many(self, rects: Iterable[pygame.Rect]) -> List[List]:
+        """
+        Returns the overlapping objects for each of rects, in the same order
+        """
+        return [self.query(rect) for rect in rects]
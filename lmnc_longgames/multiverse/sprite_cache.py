@@ -0,0 +1,65 @@
+import os
+import pygame
+
+# Sprites are drawn in white, tinting replaces this colour
+TINT_SOURCE_COLOR = (255, 255, 255)
+
+
+class SpriteCache:
+    """
+    Loads sprite frames from an asset directory, and keeps scaled and recoloured copies of them.
+
+    Surfaces are keyed by (sprite, frame, upscale factor, tint) and built on first use, so spawning a game object costs
+    a dict lookup instead of scaling and rewriting pixels. Sprite files are named <sprite>_<frame>.png, or <sprite>.png
+    for single images (frame None).
+
+    The returned surfaces are shared, blit them but don't draw on them. Use get_sprite_cache() to share a cache per
+    asset directory.
+    """
+
+    def __init__(self, asset_dir: str):
+        self.asset_dir = asset_dir
+        self._surfaces = {}
+
+    def _load(self, sprite: str, frame) -> pygame.Surface:
+        file_name = f"{sprite}.png" if frame is None else f"{sprite}_{frame}.png"
+        return pygame.image.load(os.path.join(self.asset_dir, file_name)).convert_alpha()
+
+    def get(self, sprite: str, frame: int = None, upscale_factor: int = 1, tint=None) -> pygame.Surface:
+        key = (sprite, frame, upscale_factor, tint)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            return surface
+
+        if upscale_factor == 1 and tint is None:
+            surface = self._load(sprite, frame)
+        else:
+            surface = pygame.transform.scale_by(self.get(sprite, frame), upscale_factor)
+            if tint is not None:
+                pxar = pygame.PixelArray(surface)
+                pxar.replace(TINT_SOURCE_COLOR, tint)
+                del pxar
+
+        self._surfaces[key] = surface
+        return surface
+
+    def frames(self, sprite: str, count: int, upscale_factor: int = 1, tint=None) -> list:
+        """
+        Returns the first count frames of an animated sprite
+        """
+        return [self.get(sprite, frame, upscale_factor, tint) for frame in range(count)]
+
+
+_sprite_caches = {}
+
+
+def get_sprite_cache(asset_dir: str) -> SpriteCache:
+    """
+    Returns the shared SpriteCache for asset_dir. The display must be set up before sprites are loaded from it.
+    """
+    asset_dir = os.path.realpath(asset_dir)
+    cache = _sprite_caches.get(asset_dir)
+    if cache is None:
+        cache = SpriteCache(asset_dir)
+        _sprite_caches[asset_dir] = cache
+    return cache
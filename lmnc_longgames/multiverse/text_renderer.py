@@ -0,0 +1,128 @@
+import os
+import logging
+from collections import OrderedDict
+import pygame
+
+FONT_PATH = os.path.realpath(os.path.join(os.path.dirname(__file__), "..", "icl8x8u.bdf"))
+FONT_SIZE = 8
+
+# Characters pre-rasterized into the glyph atlas, anything else is rendered and cached on first use
+ATLAS_CHARACTERS = "".join(chr(c) for c in range(32, 127))
+
+MAX_CACHED_STRINGS = 256
+
+
+class TextRenderer:
+    """
+    Renders text in the BDF font from cached glyphs.
+
+    Glyphs are rasterized once into an atlas per upscale factor, tinted atlases are made per colour on first use, and
+    strings are composed by blitting atlas cells. Composed strings are kept in an LRU so text that is redrawn every
+    frame (scores, "YOU DIED", marquee names) costs a dict lookup.
+
+    Use get_text_renderer() rather than constructing one, so the font is only loaded once per process.
+    """
+
+    def __init__(self, font_path: str = FONT_PATH, size: int = FONT_SIZE, max_cached_strings: int = MAX_CACHED_STRINGS):
+        self.font = pygame.font.Font(font_path, size)
+        self.height = self.font.get_height()
+        self.max_cached_strings = max_cached_strings
+        # upscale_factor -> (white atlas surface, {char: area rect})
+        self._atlases = {}
+        # (color, upscale_factor) -> tinted atlas surface
+        self._tinted_atlases = {}
+        # (char, color, upscale_factor) -> glyph surface, for characters outside the atlas
+        self._glyphs = {}
+        # (text, color, upscale_factor) -> rendered surface
+        self._strings = OrderedDict()
+
+    def _rasterize(self, char: str) -> pygame.Surface:
+        # Glyphs come back as colour keyed 8 bit surfaces, move them onto per-pixel alpha so they can be tinted
+        glyph = self.font.render(char, False, (255, 255, 255))
+        surface = pygame.Surface(glyph.get_size(), pygame.SRCALPHA)
+        surface.blit(glyph, (0, 0))
+        return surface
+
+    def _atlas(self, upscale_factor: int):
+        atlas = self._atlases.get(upscale_factor)
+        if atlas is None:
+            advance = self.font.size(" ")[0]
+            surface = pygame.Surface((advance * len(ATLAS_CHARACTERS), self.height), pygame.SRCALPHA)
+            for i, char in enumerate(ATLAS_CHARACTERS):
+                surface.blit(self._rasterize(char), (i * advance, 0))
+            surface = pygame.transform.scale_by(surface, upscale_factor)
+
+            cell_width = advance * upscale_factor
+            cell_height = self.height * upscale_factor
+            areas = {
+                char: pygame.Rect(i * cell_width, 0, cell_width, cell_height)
+                for i, char in enumerate(ATLAS_CHARACTERS)
+            }
+            atlas = (surface, areas)
+            self._atlases[upscale_factor] = atlas
+            logging.debug(f"Built glyph atlas for upscale factor {upscale_factor}")
+        return atlas
+
+    def _tinted_atlas(self, color, upscale_factor: int) -> pygame.Surface:
+        key = (color, upscale_factor)
+        tinted = self._tinted_atlases.get(key)
+        if tinted is None:
+            tinted = self._atlas(upscale_factor)[0].copy()
+            tinted.fill((*color[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+            self._tinted_atlases[key] = tinted
+        return tinted
+
+    def _glyph(self, char: str, color, upscale_factor: int) -> pygame.Surface:
+        key = (char, color, upscale_factor)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = pygame.transform.scale_by(self._rasterize(char), upscale_factor)
+            glyph.fill((*color[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+            self._glyphs[key] = glyph
+        return glyph
+
+    def render(self, text: str, color, upscale_factor: int = 1) -> pygame.Surface:
+        """
+        Returns a surface with text drawn in color, scaled by upscale_factor.
+
+        The returned surface is shared with the cache, don't draw on it.
+        """
+        color = tuple(color)
+        key = (text, color, upscale_factor)
+        surface = self._strings.get(key)
+        if surface is not None:
+            self._strings.move_to_end(key)
+            return surface
+
+        width, height = self.font.size(text)
+        surface = pygame.Surface((max(width, 1) * upscale_factor, height * upscale_factor), pygame.SRCALPHA)
+        atlas = self._tinted_atlas(color, upscale_factor)
+        areas = self._atlas(upscale_factor)[1]
+        x = 0
+        for char in text:
+            area = areas.get(char)
+            if area is not None:
+                surface.blit(atlas, (x, 0), area)
+                x += area.width
+            else:
+                glyph = self._glyph(char, color, upscale_factor)
+                surface.blit(glyph, (x, 0))
+                x += glyph.get_width()
+
+        self._strings[key] = surface
+        if len(self._strings) > self.max_cached_strings:
+            self._strings.popitem(last=False)
+        return surface
+
+
+_text_renderer = None
+
+
+def get_text_renderer() -> TextRenderer:
+    """
+    Returns the process wide TextRenderer, loading the font on first use. pygame must already be initialized.
+    """
+    global _text_renderer
+    if _text_renderer is None:
+        _text_renderer = TextRenderer()
+    return _text_renderer
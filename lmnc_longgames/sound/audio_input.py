@@ -0,0 +1,54 @@
+import logging
+import pyaudio
+
+RATE = 44100 # in Hz
+
+
+class AudioInput:
+    '''
+    A mono PyAudio input stream. The latest chunk of samples read is kept in buffer.
+
+    Opening one is slow (PortAudio probes every audio device) and doesn't need pygame, so the audio games open theirs
+    in prepare(), ahead of time on the preloader thread.
+    '''
+
+    def __init__(self, chunk: int, log_devices: bool = False):
+        self.buffer = None
+
+        self.p = pyaudio.PyAudio()
+        if log_devices:
+            logging.info(f"Device Count: {self.p.get_device_count()}")
+            logging.info(f"Default Device Info: {self.p.get_default_output_device_info()}")
+
+            for i in range(self.p.get_device_count()):
+                logging.info(f"Device {i}: {self.p.get_device_info_by_index(i)}")
+
+        self.stream = self.p.open(
+            format = pyaudio.paInt16,
+            channels = 1,
+            rate = RATE,
+            input=True,
+            output=False,
+            frames_per_buffer=chunk,
+            stream_callback=self.non_blocking_stream_read
+        )
+
+    def non_blocking_stream_read(self, in_data, frame_count, time_info, status):
+        self.buffer = in_data
+        return in_data, pyaudio.paContinue
+
+    def stop(self):
+        try:
+            self.stream.stop_stream()
+        except Exception as e:
+            logging.error("Exception while pausing pyaudio stream.", exc_info=e)
+
+    def start(self):
+        self.stream.start_stream()
+
+    def close(self):
+        try:
+            self.stream.close()
+            self.p.terminate()
+        except Exception as e:
+            logging.error("Exception while stopping pyaudio stream.", exc_info=e)
@@ -4,25 +4,22 @@ import time
 import logging
 import itertools
 import pygame
-import pyaudio
 import numpy
 from math import sqrt
 import imageio.v3 as iio
 from lmnc_longgames.constants import *
 from lmnc_longgames.multiverse.multiverse_game import MultiverseGame
+from lmnc_longgames.sound.audio_input import AudioInput
 
-script_path = os.path.realpath(os.path.dirname(__file__))
-font = pygame.font.Font(f"{script_path}/../icl8x8u.bdf", 8)
-
-RATE = 44100 # in Hz
+CHUNK_POW = 10
 
 class SpectrumAnalyzer(MultiverseGame):
 
-    def __init__(self, multiverse_display):
+    def __init__(self, multiverse_display, prepared = None):
         super().__init__("Audio Viz", 60, multiverse_display, fixed_fps = True)
 
         #Sample Config
-        self.chunk_pow = 10
+        self.chunk_pow = CHUNK_POW
         self.chunk = 2 ** self.chunk_pow
 
         self.bars_per_screen = 2
@@ -30,32 +27,20 @@ class SpectrumAnalyzer(MultiverseGame):
         # Floor to filter out some noise
         self.fft_level_floor = 15
 
-        self.setup_audio()
-
-
-    def setup_audio(self):
-        self.update_bars(self.bars_per_screen)
-
-        self.buffer = None
+        self.setup_audio(prepared)
 
-        p = pyaudio.PyAudio()
-        self.p = p
-        logging.info(f"Device Count: {p.get_device_count()}")
-        logging.info(f"Default Device Info: {p.get_default_output_device_info()}")
+    @classmethod
+    def prepare(cls, multiverse_display):
+        return AudioInput(2 ** CHUNK_POW, log_devices=True)
 
-        for i in range(p.get_device_count()):
-            logging.info(f"Device {i}: {p.get_device_info_by_index(i)}")
+    @classmethod
+    def release_prepared(cls, prepared):
+        prepared.close()
 
+    def setup_audio(self, audio: AudioInput = None):
+        self.update_bars(self.bars_per_screen)
 
-        self.stream = self.p.open(
-            format = pyaudio.paInt16,
-            channels = 1,
-            rate = RATE,
-            input=True,
-            output=False,
-            frames_per_buffer=self.chunk,
-            stream_callback=self.non_blocking_stream_read
-        )
+        self.audio = audio if audio is not None else AudioInput(self.chunk, log_devices=True)
         self.max_val = 200
 
         # print(self.chunk)
@@ -100,10 +85,6 @@ class SpectrumAnalyzer(MultiverseGame):
         logging.debug(f"Ranges: {ranges}")
         return ranges
 
-    def non_blocking_stream_read(self, in_data, frame_count, time_info, status):
-        self.buffer = in_data
-        return in_data, pyaudio.paContinue
-
     def interpolate_ranges(self, data):
         for (a,b) in self.ranges_to_interpolate:
             b = b + 1
@@ -128,10 +109,11 @@ class SpectrumAnalyzer(MultiverseGame):
         start = time.time()
         self.screen.fill(BLACK)
 
-        if self.buffer is None:
+        buffer = self.audio.buffer
+        if buffer is None:
             return
         
-        data = numpy.fft.rfft(numpy.frombuffer(self.buffer, dtype=numpy.int16))[1:]
+        data = numpy.fft.rfft(numpy.frombuffer(buffer, dtype=numpy.int16))[1:]
         fft = numpy.sqrt(numpy.real(data)**2+numpy.imag(data)**2) / self.chunk 
 
         fft = fft
@@ -173,16 +155,33 @@ class SpectrumAnalyzer(MultiverseGame):
             pygame.draw.rect(self.screen, color, r)
 
 
-        # rendered_text = font.render("Testing", False, (135, 0, 135))
-        # rendered_text = pygame.transform.scale_by(rendered_text, self.upscale_factor)
+        # rendered_text = self.render_text("Testing", (135, 0, 135))
         # self.screen.blit(rendered_text, (0, 0))
 
     def reset(self):
+        if self.audio is not None:
+            self.release_audio()
         self.setup_audio()
 
+    def suspend(self, release_resources=False):
+        super().suspend(release_resources)
+        if release_resources:
+            self.release_audio()
+            return
+        self.audio.stop()
+
+    def resume(self):
+        super().resume()
+        if self.audio is None:
+            self.setup_audio()
+        else:
+            self.audio.start()
+
+    def release_audio(self):
+        self.audio.close()
+        self.audio = None
+
     def teardown(self):
         logging.info("Tearing down audio_viz")
-        try:
-            self.stream.close()
-        except Exception as e:
-            logging.error("Exception while stopping pyaudio stream.", exc_info=e)
\ No newline at end of file
+        if self.audio is not None:
+            self.release_audio()
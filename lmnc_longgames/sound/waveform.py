@@ -4,17 +4,14 @@ import time
 import logging
 import itertools
 import pygame
-import pyaudio
 import numpy
 from math import sqrt
 import imageio.v3 as iio
 from lmnc_longgames.constants import *
 from lmnc_longgames.multiverse.multiverse_game import MultiverseGame
+from lmnc_longgames.sound.audio_input import AudioInput
 
-script_path = os.path.realpath(os.path.dirname(__file__))
-font = pygame.font.Font(f"{script_path}/../icl8x8u.bdf", 8)
-
-RATE = 44100 # in Hz
+CHUNK_POW = 10
 
 GAIN_STEP = 0.5
 GAIN_MAX = 10
@@ -22,35 +19,27 @@ GAIN_MIN = 0.5
 
 class Waveform(MultiverseGame):
 
-    def __init__(self, multiverse_display):
+    def __init__(self, multiverse_display, prepared = None):
         super().__init__("Waveform", 60, multiverse_display, fixed_fps = True)
 
         #Sample Config
-        self.chunk_pow = 10
+        self.chunk_pow = CHUNK_POW
         self.chunk = 2 ** self.chunk_pow
 
         self.gain = 2.0
 
-        self.setup_audio()
-
+        self.setup_audio(prepared)
 
-    def setup_audio(self):
-        self.buffer = None
+    @classmethod
+    def prepare(cls, multiverse_display):
+        return AudioInput(2 ** CHUNK_POW)
 
-        self.p = pyaudio.PyAudio()
-        self.stream = self.p.open(
-            format = pyaudio.paInt16,
-            channels = 1,
-            rate = RATE,
-            input=True,
-            output=False,
-            frames_per_buffer=self.chunk,
-            stream_callback=self.non_blocking_stream_read
-        )
+    @classmethod
+    def release_prepared(cls, prepared):
+        prepared.close()
 
-    def non_blocking_stream_read(self, in_data, frame_count, time_info, status):
-        self.buffer = in_data
-        return in_data, pyaudio.paContinue
+    def setup_audio(self, audio: AudioInput = None):
+        self.audio = audio if audio is not None else AudioInput(self.chunk)
 
 
     def scale_samples_to_surf(self, width, height, samples):
@@ -116,10 +105,11 @@ class Waveform(MultiverseGame):
         start = time.time()
         self.screen.fill(BLACK)
 
-        if self.buffer is None:
+        buffer = self.audio.buffer
+        if buffer is None:
             return
 
-        values = numpy.frombuffer(self.buffer, dtype=numpy.int16)
+        values = numpy.frombuffer(buffer, dtype=numpy.int16)
 
         values = values * self.gain
 
@@ -137,11 +127,29 @@ class Waveform(MultiverseGame):
 
         
     def reset(self):
+        if self.audio is not None:
+            self.release_audio()
         self.setup_audio()
 
+    def suspend(self, release_resources=False):
+        super().suspend(release_resources)
+        if release_resources:
+            self.release_audio()
+            return
+        self.audio.stop()
+
+    def resume(self):
+        super().resume()
+        if self.audio is None:
+            self.setup_audio()
+        else:
+            self.audio.start()
+
+    def release_audio(self):
+        self.audio.close()
+        self.audio = None
+
     def teardown(self):
         logging.info("Tearing down audio_viz")
-        try:
-            self.stream.close()
-        except Exception as e:
-            logging.error("Exception while stopping pyaudio stream.", exc_info=e)
\ No newline at end of file
+        if self.audio is not None:
+            self.release_audio()
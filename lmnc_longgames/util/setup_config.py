@@ -56,11 +56,7 @@ class SetupConfigGame(MultiverseGame):
             self.display_number(i)
 
     def display_number(self, screen_number: int):
-        script_path = os.path.realpath(os.path.dirname(__file__))
-        font = pygame.font.Font(f"{script_path}/../icl8x8u.bdf", size=8)
-
-        text = self.font.render(f"{screen_number}", False, (255,255,255))
-        text = pygame.transform.scale_by(text, self.upscale_factor)
+        text = self.render_text(f"{screen_number}", (255,255,255))
         text = pygame.transform.rotate(text, -90)
 
         self.screen.blit(
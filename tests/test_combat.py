@@ -0,0 +1,75 @@
+import unittest
+from collections import deque
+from types import SimpleNamespace
+
+import pygame
+
+from lmnc_longgames.games.combat import CombatGame, WallMask, TANK_WIDTH, TANK_HEIGHT
+
+
+def make_game(display_count: int, upscale_factor: int, seed: int) -> CombatGame:
+    """
+    A CombatGame with just enough set up to lay out arenas, for a wall of display_count displays
+    """
+    game = CombatGame.__new__(CombatGame)
+    game.multiverse_display = SimpleNamespace(
+        width=display_count * 11 * upscale_factor,
+        height=53 * upscale_factor,
+        upscale_factor=upscale_factor,
+        multiverse=SimpleNamespace(displays=[None] * display_count),
+    )
+    game.arena_seed = seed
+    return game
+
+
+def tank_reachable(game: CombatGame, mask: WallMask, start, end) -> bool:
+    """
+    Flood fill the positions a tank can move between, a pixel at a time, keeping to the area tanks are clamped to
+    """
+    width = TANK_WIDTH * game.upscale_factor
+    height = TANK_HEIGHT * game.upscale_factor
+    max_x = game.width - 1 - width
+    max_y = game.height - 1 - height
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == end:
+            return True
+        for next_x, next_y in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if not (0 <= next_x <= max_x and 0 <= next_y <= max_y) or (next_x, next_y) in seen:
+                continue
+            if mask.rect_blocked(pygame.Rect(next_x, next_y, width, height)):
+                continue
+            seen.add((next_x, next_y))
+            queue.append((next_x, next_y))
+    return False
+
+
+class CombatArenaTest(unittest.TestCase):
+    def test_every_wall_size_gets_a_playable_arena(self):
+        for display_count in (1, 2, 3, 10):
+            for upscale_factor in (1, 2, 3):
+                for seed in range(5):
+                    with self.subTest(displays=display_count, upscale=upscale_factor, seed=seed):
+                        game = make_game(display_count, upscale_factor, seed)
+                        walls = game.build_arena()
+                        self.assertGreater(len(walls), 0)
+
+                        mask = WallMask(game.width, game.height, walls)
+                        width = TANK_WIDTH * upscale_factor
+                        height = TANK_HEIGHT * upscale_factor
+                        # Where the tanks start, the second one once it's clamped into the arena
+                        start = (0, 0)
+                        end = (game.width - 1 - width, game.height - 1 - height)
+                        self.assertFalse(mask.rect_blocked(pygame.Rect(*start, width, height)))
+                        self.assertFalse(mask.rect_blocked(pygame.Rect(*end, width, height)))
+                        self.assertTrue(tank_reachable(game, mask, start, end))
+
+    def test_seed_pins_the_arena(self):
+        self.assertEqual(make_game(10, 1, 7).build_arena(), make_game(10, 1, 7).build_arena())
+        self.assertEqual(make_game(1, 1, 7).build_arena(), make_game(1, 1, 7).build_arena())
+
+
+if __name__ == "__main__":
+    unittest.main()
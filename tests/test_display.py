@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+import lmnc_longgames.multiverse as multiverse
+from lmnc_longgames.multiverse import Display
+
+
+class FakeLinkDisplay(Display):
+    """
+    A display whose writes always succeed, driven by hand on a fake clock instead of by its thread
+    """
+
+    def __init__(self):
+        super().__init__("fake", 53, 11, 0, 0)
+        self.now = 0.0
+        self.writes = 0
+        self._buffer = b"frame"
+
+    def write(self, header, data=None):
+        self.writes += 1
+        return True
+
+    def send(self, after: float):
+        self.now += after
+        with mock.patch.object(multiverse.time, "perf_counter", lambda: self.now):
+            self._update_display()
+
+
+class DisplayFrameRateTest(unittest.TestCase):
+    def test_measures_link_frame_rate(self):
+        display = FakeLinkDisplay()
+        self.assertIsNone(display.frame_rate)
+        for _ in range(100):
+            display.send(0.025)
+        self.assertAlmostEqual(display.frame_rate, 40)
+
+    def test_pause_isnt_counted_as_a_slow_frame(self):
+        display = FakeLinkDisplay()
+        for _ in range(100):
+            display.send(0.025)
+
+        display.pause()
+        # Nothing changed, nothing is sent
+        display.send(10)
+        self.assertEqual(display.writes, 100)
+        # A changed frame goes out once while paused
+        display._buffer_dirty = True
+        display.send(10)
+        self.assertEqual(display.writes, 101)
+        display.send(10)
+        display.resume()
+
+        display.send(0.025)
+        self.assertAlmostEqual(display.frame_rate, 40)
+        display.send(0.025)
+        self.assertAlmostEqual(display.frame_rate, 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
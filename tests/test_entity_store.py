@@ -0,0 +1,31 @@
+import unittest
+
+import numpy
+import pygame
+
+from lmnc_longgames.multiverse.multiverse_game import EntityStore
+
+
+class EntityStoreTest(unittest.TestCase):
+    def test_edges_follow_positions(self):
+        store = EntityStore(None, 3, 4, 2)
+        store.set_position(numpy.array([True, False, True]), [1.7, -2.5], 5.9)
+        store.set_position(1, 10, 20)
+        numpy.testing.assert_array_equal(store.left, [1, 10, -2])
+        numpy.testing.assert_array_equal(store.top, [5, 20, 5])
+        numpy.testing.assert_array_equal(store.right, store.left + 4)
+        numpy.testing.assert_array_equal(store.bottom, store.top + 2)
+        numpy.testing.assert_array_equal(store.centerx, store.left + 2)
+        numpy.testing.assert_array_equal(store.centery, store.top + 1)
+
+    def test_rect_matches_edges(self):
+        store = EntityStore(None, 2, 3, 3)
+        store.set_position(slice(None), [4.2, 8.8], [0.5, 1.0])
+        for i in range(2):
+            rect = store.rect(i)
+            self.assertEqual(rect, pygame.Rect(store.left[i], store.top[i], 3, 3))
+            self.assertEqual(rect.center, (store.centerx[i], store.centery[i]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+
+from lmnc_longgames.multiverse import frame_scheduler
+from lmnc_longgames.multiverse.frame_scheduler import FrameScheduler
+
+
+class FakeClock:
+    """
+    Stands in for perf_counter and sleep, time only moves when slept or advanced
+    """
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FrameSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(
+            frame_scheduler.time, perf_counter=self.clock.perf_counter, sleep=self.clock.sleep
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = FrameScheduler()
+
+    def test_waits_until_each_deadline(self):
+        start = self.clock.now
+        for frame in range(1, 6):
+            self.assertFalse(self.scheduler.wait(50))
+            self.assertAlmostEqual(self.clock.now, start + frame * 0.02)
+        self.assertEqual(self.scheduler.missed_deadlines, 0)
+
+    def test_long_frame_is_paid_back(self):
+        start = self.clock.now
+        self.scheduler.wait(50)
+        # A frame that takes 1.5 periods
+        self.clock.now += 0.03
+        self.assertTrue(self.scheduler.wait(50))
+        # The next deadline is still on the original schedule
+        self.assertFalse(self.scheduler.wait(50))
+        self.assertAlmostEqual(self.clock.now, start + 0.06)
+        self.assertEqual(self.scheduler.missed_deadlines, 1)
+
+    def test_reanchors_when_far_behind(self):
+        self.scheduler.wait(50)
+        self.clock.now += 1.0
+        behind = self.clock.now
+        self.assertTrue(self.scheduler.wait(50))
+        self.assertFalse(self.scheduler.wait(50))
+        self.assertAlmostEqual(self.clock.now, behind + 0.02)
+
+    def test_changing_rate_starts_a_new_schedule(self):
+        self.scheduler.wait(50)
+        start = self.clock.now
+        self.scheduler.wait(10)
+        self.assertAlmostEqual(self.clock.now, start + 0.1)
+
+    def test_precise_wait_sleeps_short(self):
+        # Spinning on the fake clock would never end, so advance it on every read once the sleep is done
+        def perf_counter():
+            self.clock.now += 0.0005
+            return self.clock.now
+
+        with mock.patch.object(frame_scheduler.time, "perf_counter", perf_counter):
+            self.scheduler.wait(50, precise=True)
+            deadline = self.scheduler.next_deadline
+            self.scheduler.wait(50, precise=True)
+        self.assertLess(self.clock.slept[-1], 0.02 - self.scheduler.spin_threshold + 1e-9)
+        self.assertGreaterEqual(self.clock.now, deadline)
+
+
+if __name__ == "__main__":
+    unittest.main()
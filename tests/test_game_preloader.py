@@ -0,0 +1,221 @@
+import threading
+import unittest
+
+from lmnc_longgames.multiverse.game_preloader import GamePreloader
+
+
+DISPLAY = object()
+
+
+class FakeGame:
+    pass
+
+
+class Resource:
+    def __init__(self, args):
+        self.args = args
+        self.released = False
+
+
+class PreparedGame:
+    """
+    Opens a resource in prepare(), and records the ones it's asked to release
+    """
+
+    prepared = []
+
+    @classmethod
+    def prepare(cls, multiverse_display, *args):
+        assert multiverse_display is DISPLAY
+        resource = Resource(args)
+        cls.prepared.append(resource)
+        return resource
+
+    @classmethod
+    def release_prepared(cls, prepared):
+        prepared.released = True
+
+
+class FakeRegistry:
+    """
+    Resolves names from a dict. Names in gated set their started event, then wait for their gate to be set before
+    resolving.
+    """
+
+    def __init__(self, games, gated=()):
+        self.games = games
+        self.started = {name: threading.Event() for name in gated}
+        self.gates = {name: threading.Event() for name in gated}
+        self.resolved = []
+        self.lock = threading.Lock()
+
+    def resolve(self, name):
+        gate = self.gates.get(name)
+        if gate is not None:
+            self.started[name].set()
+            gate.wait(5)
+        game = self.games[name]
+        with self.lock:
+            self.resolved.append(name)
+        return game
+
+
+class GamePreloaderTest(unittest.TestCase):
+    def setUp(self):
+        self.preloaders = []
+
+    def tearDown(self):
+        for preloader in self.preloaders:
+            preloader.stop()
+
+    def make(self, registry):
+        preloader = GamePreloader(registry, DISPLAY)
+        self.preloaders.append(preloader)
+        return preloader
+
+    def wait_until_idle(self, preloader):
+        with preloader._condition:
+            idle = preloader._condition.wait_for(
+                lambda: preloader._resolving is None and preloader._next_key() is None, 5
+            )
+        self.assertTrue(idle)
+
+    def test_key(self):
+        self.assertEqual(GamePreloader.key("pong", [0, 1]), ("pong", (0, 1)))
+        self.assertEqual(GamePreloader.key("pong"), ("pong", ()))
+
+    def test_take_before_want(self):
+        preloader = self.make(FakeRegistry({"pong": FakeGame}))
+        self.assertIsNone(preloader.take(GamePreloader.key("pong")))
+
+    def test_want_then_take(self):
+        registry = FakeRegistry({"pong": FakeGame}, gated=["pong"])
+        preloader = self.make(registry)
+        key = GamePreloader.key("pong", [1])
+        preloader.want([key])
+        registry.gates["pong"].set()
+        self.wait_until_idle(preloader)
+        self.assertEqual(preloader.take(key), (FakeGame, None))
+
+    def test_take_waits_for_the_key_being_resolved(self):
+        registry = FakeRegistry({"pong": FakeGame}, gated=["pong"])
+        preloader = self.make(registry)
+        key = GamePreloader.key("pong")
+        preloader.want([key])
+        self.assertTrue(registry.started["pong"].wait(5))
+        # Still blocked in the registry, a short wait gives up
+        self.assertIsNone(preloader.take(key, timeout=0.05))
+        threading.Timer(0.05, registry.gates["pong"].set).start()
+        self.assertEqual(preloader.take(key, timeout=5), (FakeGame, None))
+
+    def test_take_leaves_wanted_alone(self):
+        registry = FakeRegistry({"pong": FakeGame})
+        preloader = self.make(registry)
+        key = GamePreloader.key("pong")
+        preloader.want([key])
+        self.wait_until_idle(preloader)
+        self.assertEqual(preloader.take(key), (FakeGame, None))
+        self.assertEqual(preloader._wanted, [key])
+        # Taken again, the class is still there and isn't resolved a second time
+        self.assertEqual(preloader.take(key), (FakeGame, None))
+        self.assertEqual(registry.resolved, ["pong"])
+
+    def test_resolves_in_priority_order(self):
+        registry = FakeRegistry({"first": FakeGame, "second": FakeGame, "third": FakeGame}, gated=["first"])
+        preloader = self.make(registry)
+        keys = [GamePreloader.key(name) for name in ("first", "second", "third")]
+        preloader.want(keys)
+        # Reordered while the first is being resolved, the rest follow the new order
+        preloader.want([keys[0], keys[2], keys[1]])
+        registry.gates["first"].set()
+        self.wait_until_idle(preloader)
+        self.assertEqual(registry.resolved, ["first", "third", "second"])
+
+    def test_failed_keys_are_not_retried(self):
+        registry = FakeRegistry({"pong": FakeGame})
+        preloader = self.make(registry)
+        broken = GamePreloader.key("broken")
+        pong = GamePreloader.key("pong")
+        preloader.want([broken, pong])
+        self.wait_until_idle(preloader)
+        self.assertEqual(preloader.take(pong), (FakeGame, None))
+        self.assertIsNone(preloader.take(broken))
+        self.assertEqual(preloader._failed, {broken})
+
+        # Wanting it again while it's still wanted doesn't retry it, dropping it out of the list forgets the failure
+        preloader.want([broken, pong])
+        self.wait_until_idle(preloader)
+        self.assertEqual(preloader._failed, {broken})
+        self.assertEqual(registry.resolved, ["pong"])
+        preloader.want([pong])
+        self.assertEqual(preloader._failed, set())
+
+    def test_prepared_resources_are_handed_over_once(self):
+        PreparedGame.prepared = []
+        registry = FakeRegistry({"video": PreparedGame})
+        preloader = self.make(registry)
+        key = GamePreloader.key("video", ["clip.mp4"])
+        preloader.want([key])
+        self.wait_until_idle(preloader)
+
+        game_class, prepared = preloader.take(key)
+        self.assertIs(game_class, PreparedGame)
+        self.assertEqual(prepared.args, ("clip.mp4",))
+        # Used by the game now, so not prepared again or released while it's still wanted
+        self.assertEqual(preloader.take(key), (PreparedGame, None))
+        preloader.want([key])
+        self.wait_until_idle(preloader)
+        self.assertEqual(len(PreparedGame.prepared), 1)
+        self.assertFalse(prepared.released)
+
+        # Wanted again after dropping out, it's prepared afresh
+        preloader.want([])
+        preloader.want([key])
+        self.wait_until_idle(preloader)
+        self.assertEqual(len(PreparedGame.prepared), 2)
+        self.assertFalse(prepared.released)
+
+    def test_unused_resources_are_released(self):
+        PreparedGame.prepared = []
+        registry = FakeRegistry({"video": PreparedGame, "audio": PreparedGame})
+        preloader = self.make(registry)
+        video = GamePreloader.key("video", ["clip.mp4"])
+        audio = GamePreloader.key("audio")
+        preloader.want([video, audio])
+        self.wait_until_idle(preloader)
+        video_resource, audio_resource = PreparedGame.prepared
+
+        preloader.want([audio])
+        self.assertTrue(video_resource.released)
+        self.assertFalse(audio_resource.released)
+        preloader.stop()
+        self.assertTrue(audio_resource.released)
+
+    def test_resources_prepared_after_dropping_out_are_released(self):
+        PreparedGame.prepared = []
+        registry = FakeRegistry({"video": PreparedGame}, gated=["video"])
+        preloader = self.make(registry)
+        key = GamePreloader.key("video")
+        preloader.want([key])
+        self.assertTrue(registry.started["video"].wait(5))
+        preloader.want([])
+        registry.gates["video"].set()
+        self.wait_until_idle(preloader)
+        self.assertIsNone(preloader.take(key))
+        self.assertTrue(PreparedGame.prepared[0].released)
+
+    def test_stop(self):
+        registry = FakeRegistry({"pong": FakeGame})
+        preloader = self.make(registry)
+        preloader.want([GamePreloader.key("pong")])
+        preloader.stop()
+        preloader._thread.join(5)
+        self.assertFalse(preloader._thread.is_alive())
+        # Nothing starts once stopped
+        preloader.want([GamePreloader.key("other")])
+        self.assertEqual(preloader._wanted, [GamePreloader.key("other")])
+        self.assertFalse(preloader._thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
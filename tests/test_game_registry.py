@@ -0,0 +1,27 @@
+import unittest
+
+from lmnc_longgames.multiverse.game_registry import GameRegistry
+from lmnc_longgames.games.snake import SnakeGame
+
+
+class GameRegistryTest(unittest.TestCase):
+    def test_resolves_module_paths(self):
+        registry = GameRegistry()
+        game = registry.resolve("lmnc_longgames.games.snake:SnakeGame")
+        self.assertIs(game, SnakeGame)
+        # Cached after the first lookup
+        self.assertIs(registry._games["lmnc_longgames.games.snake:SnakeGame"], SnakeGame)
+
+    def test_classes_pass_through(self):
+        self.assertIs(GameRegistry().resolve(SnakeGame), SnakeGame)
+
+    def test_unknown_names(self):
+        registry = GameRegistry()
+        with self.assertRaises(LookupError):
+            registry.resolve("no-such-game")
+        with self.assertRaises(AttributeError):
+            registry.resolve("lmnc_longgames.games.snake:NoSuchGame")
+
+
+if __name__ == "__main__":
+    unittest.main()
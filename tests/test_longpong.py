@@ -0,0 +1,142 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy
+
+from lmnc_longgames.multiverse import Display
+from lmnc_longgames.multiverse.multiverse_game import PygameMultiverseDisplay
+from lmnc_longgames.games.longpong import Balls, LongPongGame, MODE_AI_VS_AI
+
+
+display = None
+
+
+def setUpModule():
+    global display
+    display = PygameMultiverseDisplay("Long Pong Test", 1, headless=True)
+    display.configure_display([Display("dummy", 53, 11, 0, 11 * i, dummy=True) for i in range(10)])
+
+
+def tearDownModule():
+    display.stop()
+    display.sound_trigger_out.close()
+
+
+def simulate_to_line(game: LongPongGame, which: int, paddle_x: float, dt: float = 1e-4) -> float:
+    """
+    Step a ball along in small steps, bouncing off the top and bottom, until it reaches paddle_x. Returns its y there.
+    """
+    balls = game.balls
+    court = game.height - 1 - balls.radius
+    x, y = balls.x[which], balls.y[which]
+    speed_x = balls.speed_x[which] * game.upscale_factor
+    speed_y = balls.speed_y[which] * game.upscale_factor
+    while True:
+        next_x = x + speed_x * dt
+        next_y = y + speed_y * dt
+        if (next_x - paddle_x) * (x - paddle_x) <= 0:
+            return y + (next_y - y) * (paddle_x - x) / (next_x - x)
+        x, y = next_x, next_y
+        if y < 0:
+            y, speed_y = -y, -speed_y
+        elif y > court:
+            y, speed_y = 2 * court - y, -speed_y
+
+
+class LongPongTest(unittest.TestCase):
+    def setUp(self):
+        numpy.random.seed(3)
+        self.game = LongPongGame(display, MODE_AI_VS_AI, ball_count=20)
+        # Nothing in these tests should make noise
+        self.game.random_note = lambda: None
+        self.game.play_note = lambda *args, **kwargs: None
+
+    def aim(self, balls, which, x, y, angle, direction_x, direction_y, speed=50):
+        balls.set_position(which, x, y)
+        balls.prev_x[which] = balls.x[which]
+        balls.prev_y[which] = balls.y[which]
+        balls.angle[which] = angle
+        balls.direction_x[which] = direction_x
+        balls.direction_y[which] = direction_y
+        balls.speed[which] = speed
+        balls.aim_error[which] = 0
+
+    def test_fold_into_court(self):
+        game = self.game
+        court = game.height - 1 - game.balls.radius
+        y, flipped = game.fold_into_court(
+            numpy.array([5.0, -3.0, court + 4, 2 * court + 7, 3 * court + 1, -2 * court - 2])
+        )
+        numpy.testing.assert_allclose(y, [5, 3, court - 4, 7, court - 1, 2])
+        numpy.testing.assert_array_equal(flipped, [False, True, True, False, True, True])
+
+    def test_intercept_matches_simulated_ball(self):
+        game = self.game
+        balls = game.balls
+        rng = numpy.random.default_rng(11)
+        which = numpy.ones(balls.count, dtype=bool)
+        self.aim(
+            balls,
+            which,
+            rng.uniform(10, game.width - 10, balls.count),
+            rng.uniform(0, game.height - 1 - balls.radius, balls.count),
+            rng.uniform(0.02, numpy.pi / 4, balls.count),
+            rng.choice((-1.0, 1.0), balls.count),
+            rng.choice((-1.0, 1.0), balls.count),
+            rng.uniform(Balls.min_speed, Balls.max_speed, balls.count),
+        )
+        game.predict_intercepts(which)
+
+        for i in range(balls.count):
+            player = game.player_one if balls.direction_x[i] < 0 else game.player_two
+            expected = simulate_to_line(game, i, game.paddle_line(player))
+            self.assertAlmostEqual(balls.intercept_y[i] - balls.radius / 2, expected, delta=0.05, msg=f"ball {i}")
+            self.assertAlmostEqual(
+                balls.arrive_at[i] - game.sim_time,
+                abs(game.paddle_line(player) - balls.x[i]) / abs(balls.speed_x[i] * game.upscale_factor),
+            )
+
+    def test_aim_error_is_kept_through_wall_bounces(self):
+        game = self.game
+        balls = game.balls
+        which = numpy.zeros(balls.count, dtype=bool)
+        which[0] = True
+        self.aim(balls, which, game.width // 2, 1, numpy.pi / 4, 1.0, -1.0)
+        game.predict_intercepts(which, new_shot=True)
+        error = balls.aim_error[0]
+        intercept = balls.intercept_y[0]
+        # Bounce off the top
+        for _ in range(10):
+            game.update_balls(1 / 120)
+            if balls.direction_y[0] > 0:
+                break
+        self.assertGreater(balls.direction_y[0], 0)
+        self.assertEqual(balls.aim_error[0], error)
+        self.assertAlmostEqual(balls.intercept_y[0], intercept)
+
+    def test_long_step_hits_the_paddle(self):
+        game = LongPongGame(display, MODE_AI_VS_AI)
+        game.random_note = lambda: None
+        balls = game.balls
+        player = game.player_two
+        which = numpy.ones(1, dtype=bool)
+        for dt in (1 / 120, 0.5, 5.0):
+            # Aimed at the middle of the right paddle from most of the screen away. At 45 degrees the ball moves as far
+            # in y as in x, so it starts where that distance folds back to the paddle's middle, bouncing on the way.
+            target_y = player._rect.centery - balls.radius / 2
+            distance = game.width * 0.8
+            start_y, flipped = game.fold_into_court(numpy.array([target_y - distance]))
+            direction_y = -1.0 if flipped[0] else 1.0
+            self.aim(balls, which, game.paddle_line(player) - distance, start_y, numpy.pi / 4, 1.0, direction_y, 80)
+
+            for _ in range(1000):
+                game.update_balls(dt)
+                if balls.direction_x[0] < 0:
+                    break
+            self.assertLess(balls.direction_x[0], 0, f"dt {dt}")
+            self.assertEqual((game.player_one.score, player.score), (0, 0), f"dt {dt}")
+
+if __name__ == "__main__":
+    unittest.main()
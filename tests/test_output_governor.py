@@ -0,0 +1,63 @@
+import unittest
+
+from lmnc_longgames.multiverse.output_governor import OutputGovernor
+
+
+class OutputGovernorTest(unittest.TestCase):
+    def settle(self, governor, measured_fps, now=0.0):
+        governor.update(measured_fps, now)
+        governor.update(measured_fps, now + governor.settle_time)
+        return now + governor.settle_time
+
+    def test_uncapped_until_measured(self):
+        governor = OutputGovernor()
+        governor.update(None, 0.0)
+        self.assertIsNone(governor.cap)
+        self.assertTrue(all(governor.should_send(i * 0.001) for i in range(100)))
+
+    def test_cap_follows_measured_rate_after_settling(self):
+        governor = OutputGovernor(headroom=0.9)
+        governor.update(40, 0.0)
+        governor.update(40, 0.5)
+        self.assertIsNone(governor.cap)
+        governor.update(40, 1.0)
+        self.assertAlmostEqual(governor.cap, 36)
+
+        # Small changes are inside the hysteresis band and don't move it
+        self.settle(governor, 41, 2.0)
+        self.assertAlmostEqual(governor.cap, 36)
+
+        # A blip that doesn't last doesn't move it either
+        governor.update(20, 5.0)
+        governor.update(40, 5.5)
+        governor.update(20, 6.0)
+        self.assertAlmostEqual(governor.cap, 36)
+
+        self.settle(governor, 20, 8.0)
+        self.assertAlmostEqual(governor.cap, 18)
+
+    def test_cap_never_below_min_fps(self):
+        governor = OutputGovernor(min_fps=15)
+        self.settle(governor, 2)
+        self.assertEqual(governor.cap, 15)
+
+    def test_should_send_paces_to_the_cap(self):
+        governor = OutputGovernor(headroom=1.0)
+        now = self.settle(governor, 20)
+        # Offered frames at 100 fps for a second, 20 go out
+        sent = sum(governor.should_send(now + i * 0.01) for i in range(100))
+        self.assertEqual(sent, 20)
+        self.assertEqual(governor.skipped_frames, 80)
+
+    def test_reset(self):
+        governor = OutputGovernor()
+        self.settle(governor, 20)
+        governor.should_send(0.0)
+        governor.should_send(0.001)
+        governor.reset()
+        self.assertIsNone(governor.cap)
+        self.assertEqual(governor.skipped_frames, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
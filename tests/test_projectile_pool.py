@@ -0,0 +1,78 @@
+import unittest
+
+from lmnc_longgames.multiverse.projectile_pool import AnimationClock, ProjectilePool
+
+
+class Shot:
+    def __init__(self):
+        self.position = None
+
+    def spawn(self, position):
+        self.position = position
+
+
+class ProjectilePoolTest(unittest.TestCase):
+    def test_spawn_until_exhausted(self):
+        pool = ProjectilePool(Shot, 3)
+        shots = [pool.spawn(i) for i in range(3)]
+        self.assertTrue(all(shot.active for shot in shots))
+        self.assertEqual([shot.position for shot in pool], [0, 1, 2])
+        self.assertIsNone(pool.spawn(3))
+        self.assertEqual(len(pool), 3)
+
+    def test_despawn_while_iterating(self):
+        pool = ProjectilePool(Shot, 4)
+        for i in range(4):
+            pool.spawn(i)
+        for shot in pool:
+            if shot.position % 2 == 0:
+                pool.despawn(shot)
+        self.assertEqual([shot.position for shot in pool], [1, 3])
+        # Not free until swept
+        self.assertIsNone(pool.spawn(4))
+        pool.sweep()
+        self.assertEqual(len(pool), 2)
+        pool.spawn(4)
+        pool.spawn(5)
+        self.assertEqual([shot.position for shot in pool], [1, 3, 4, 5])
+
+    def test_spawn_while_iterating(self):
+        pool = ProjectilePool(Shot, 3)
+        pool.spawn(0)
+        seen = []
+        for shot in pool:
+            seen.append(shot.position)
+            if shot.position < 2:
+                pool.spawn(shot.position + 1)
+        self.assertEqual(seen, [0, 1, 2])
+
+    def test_clear(self):
+        pool = ProjectilePool(Shot, 2)
+        shots = [pool.spawn(i) for i in range(2)]
+        pool.despawn(shots[0])
+        pool.clear()
+        self.assertEqual(list(pool), [])
+        self.assertFalse(any(shot.active for shot in shots))
+        self.assertIsNotNone(pool.spawn(0))
+        self.assertIsNotNone(pool.spawn(1))
+        self.assertIsNone(pool.spawn(2))
+
+
+class AnimationClockTest(unittest.TestCase):
+    def test_steps_and_wraps(self):
+        clock = AnimationClock(0.1, 4)
+        clock.update(0.05)
+        self.assertEqual(clock.frame, 0)
+        clock.update(0.06)
+        self.assertEqual(clock.frame, 1)
+        # A long frame skips ahead, keeping the remainder
+        clock.update(0.35)
+        self.assertEqual(clock.frame, 0)
+        clock.update(0.05)
+        self.assertEqual(clock.frame, 1)
+        clock.reset()
+        self.assertEqual(clock.frame, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import random
+import unittest
+
+from lmnc_longgames.games.snake import DistanceField, FreeCells
+
+
+WIDTH = 12
+HEIGHT = 7
+
+
+def all_cells():
+    return [(x, y) for x in range(WIDTH) for y in range(HEIGHT)]
+
+
+class FreeCellsTest(unittest.TestCase):
+    def test_add_remove_choice(self):
+        rng = random.Random(7)
+        free = FreeCells(WIDTH, HEIGHT)
+        expected = set(all_cells())
+        self.assertEqual(len(free), WIDTH * HEIGHT)
+
+        for _ in range(2000):
+            cell = rng.choice(all_cells())
+            if rng.random() < 0.5:
+                free.remove(cell)
+                expected.discard(cell)
+            else:
+                free.add(cell)
+                expected.add(cell)
+            self.assertEqual(len(free), len(expected))
+            self.assertEqual(set(free.cells), expected)
+            self.assertEqual(cell in free, cell in expected)
+            if expected:
+                self.assertIn(free.choice(), expected)
+
+
+class DistanceFieldTest(unittest.TestCase):
+    def assert_matches_recompute(self, field: DistanceField):
+        patched = list(field.distances)
+        field.recompute()
+        self.assertEqual(patched, field.distances)
+
+    def test_open_grid(self):
+        field = DistanceField(WIDTH, HEIGHT)
+        field.set_target((3, 2))
+        for x, y in all_cells():
+            self.assertEqual(field.distance((x, y)), abs(x - 3) + abs(y - 2))
+
+    def test_wall_cuts_off_cells(self):
+        field = DistanceField(WIDTH, HEIGHT)
+        field.set_target((0, 0))
+        for y in range(HEIGHT):
+            field.block((5, y))
+            self.assert_matches_recompute(field)
+        self.assertGreaterEqual(field.distance((6, 0)), 1 << 30)
+        self.assertEqual(field.open_area((6, 0), 1000), (WIDTH - 6) * HEIGHT)
+
+        # Opening a gap lets the far side back in, round through the gap
+        field.unblock((5, HEIGHT - 1))
+        self.assert_matches_recompute(field)
+        self.assertEqual(field.distance((6, 0)), 5 + 2 * (HEIGHT - 1) + 1)
+
+    def test_blocking_the_target(self):
+        field = DistanceField(WIDTH, HEIGHT)
+        field.set_target((4, 4))
+        field.block((4, 4))
+        self.assertIsNone(field.target)
+        self.assertTrue(all(distance >= 1 << 30 for distance in field.distances))
+
+    def test_incremental_updates_match_recompute(self):
+        """
+        Move a random snake around the grid, patching the field every step, and compare it with a full search
+        """
+        rng = random.Random(42)
+        field = DistanceField(WIDTH, HEIGHT)
+        snake = [(0, 0)]
+        field.block(snake[0])
+        field.set_target((WIDTH - 1, HEIGHT - 1))
+
+        for step in range(3000):
+            head_x, head_y = snake[-1]
+            moves = [
+                (head_x + dx, head_y + dy)
+                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                if 0 <= head_x + dx < WIDTH and 0 <= head_y + dy < HEIGHT
+            ]
+            moves = [cell for cell in moves if not field.blocked[field.cell_id(cell)]]
+            if not moves:
+                # Boxed in, start again from a free cell
+                for cell in snake:
+                    field.unblock(cell)
+                    self.assert_matches_recompute(field)
+                snake = [rng.choice(all_cells())]
+                field.block(snake[0])
+                self.assert_matches_recompute(field)
+                continue
+
+            head = rng.choice(moves)
+            snake.append(head)
+            field.block(head)
+            self.assert_matches_recompute(field)
+            if rng.random() < 0.8 and len(snake) > 1:
+                field.unblock(snake.pop(0))
+                self.assert_matches_recompute(field)
+
+            if field.target is None or rng.random() < 0.02:
+                free = [cell for cell in all_cells() if not field.blocked[field.cell_id(cell)]]
+                field.set_target(rng.choice(free))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import random
+import unittest
+
+import pygame
+
+from lmnc_longgames.multiverse.spatial_index import SpatialHash
+
+
+def random_rect(rng: random.Random) -> pygame.Rect:
+    return pygame.Rect(rng.randint(-20, 120), rng.randint(-20, 60), rng.randint(0, 12), rng.randint(0, 12))
+
+
+class SpatialHashTest(unittest.TestCase):
+    def assert_matches_brute_force(self, index: SpatialHash, rects: dict, query: pygame.Rect):
+        expected = {obj for obj, rect in rects.items() if rect.colliderect(query)}
+        found = index.query(query)
+        self.assertEqual(len(found), len(set(found)), "query returned duplicates")
+        self.assertEqual(set(found), expected, f"query {query}")
+
+    def test_query(self):
+        index = SpatialHash(4)
+        a = pygame.Rect(0, 0, 2, 2)
+        b = pygame.Rect(10, 10, 3, 3)
+        index.insert("a", a)
+        index.insert("b", b)
+        self.assertEqual(index.query(pygame.Rect(1, 1, 1, 1)), ["a"])
+        self.assertEqual(index.query(pygame.Rect(0, 0, 20, 20)), ["a", "b"])
+        # Same cells as a, but not touching it
+        self.assertEqual(index.query(pygame.Rect(2, 2, 1, 1)), [])
+        self.assertEqual(len(index), 2)
+        self.assertIn("a", index)
+        self.assertNotIn("c", index)
+
+    def test_rect_spanning_cells(self):
+        index = SpatialHash(4)
+        index.insert("wide", pygame.Rect(-6, 1, 20, 2))
+        for x in range(-6, 14):
+            self.assertEqual(index.query(pygame.Rect(x, 2, 1, 1)), ["wide"])
+        self.assertEqual(index.query(pygame.Rect(14, 2, 1, 1)), [])
+
+    def test_update_follows_the_registered_rect(self):
+        index = SpatialHash(4)
+        rect = pygame.Rect(0, 0, 2, 2)
+        index.insert("a", rect)
+        rect.topleft = (30, 30)
+        index.update("a")
+        self.assertEqual(index.query(pygame.Rect(0, 0, 2, 2)), [])
+        self.assertEqual(index.query(pygame.Rect(31, 31, 1, 1)), ["a"])
+
+        # Inserting again moves it to the new rect
+        index.insert("a", pygame.Rect(50, 0, 2, 2))
+        self.assertEqual(index.query(pygame.Rect(30, 30, 4, 4)), [])
+        self.assertEqual(index.query(pygame.Rect(50, 0, 1, 1)), ["a"])
+        self.assertEqual(len(index), 1)
+
+    def test_remove_and_clear(self):
+        index = SpatialHash(4)
+        index.insert("a", pygame.Rect(0, 0, 2, 2))
+        index.insert("b", pygame.Rect(1, 1, 2, 2))
+        index.remove("a")
+        index.remove("a")
+        self.assertEqual(index.query(pygame.Rect(0, 0, 4, 4)), ["b"])
+        index.clear()
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.query(pygame.Rect(0, 0, 4, 4)), [])
+        self.assertEqual(index._cells, {})
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(1234)
+        for cell_size in (1, 3, 8, 64):
+            index = SpatialHash(cell_size)
+            rects = {}
+            for obj in range(200):
+                rects[obj] = random_rect(rng)
+                index.insert(obj, rects[obj])
+
+            for _ in range(500):
+                action = rng.random()
+                obj = rng.randrange(250)
+                if action < 0.4 and obj in rects:
+                    rects[obj].topleft = random_rect(rng).topleft
+                    index.update(obj)
+                elif action < 0.6:
+                    rects.pop(obj, None)
+                    index.remove(obj)
+                elif action < 0.8:
+                    rects[obj] = random_rect(rng)
+                    index.insert(obj, rects[obj])
+                self.assert_matches_brute_force(index, rects, random_rect(rng))
+
+            self.assertEqual(len(index), len(rects))
+            queries = [random_rect(rng) for _ in range(20)]
+            for query, found in zip(queries, index.query_many(queries)):
+                self.assertEqual(set(found), {obj for obj, rect in rects.items() if rect.colliderect(query)})
+
+
+if __name__ == "__main__":
+    unittest.main()